@@ -0,0 +1,210 @@
+"""Scaling benchmark: python bench.py [--scales 1,10,100,1000] [--update]
+
+Builds synthetic buildings of 1x, 10x, ... the model's component count, times
+each hot-path stage, records peak traced memory and payload bytes, and exits
+non-zero when a stage regresses against bench_baseline.json. Timings are only
+comparable on the machine that wrote the baseline; refresh it there with --update.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+
+from components import ComponentStore
+from geometry import mesh_traces
+from model import Params, build_model
+from payload import compact_traces, measure
+from search import SearchIndex
+from spatial import SpatialIndex
+
+BASELINE = Path(__file__).with_name("bench_baseline.json")
+BLOCK_GAP = 2.0  # metres between replicated blocks, so copies never clash
+
+# Allowed slowdown before a stage counts as a regression; the absolute floors keep
+# millisecond-scale stages from failing on scheduler noise.
+TIME_TOLERANCE, TIME_FLOOR = 0.5, 0.005
+MEMORY_TOLERANCE, MEMORY_FLOOR = 0.25, 1 << 20
+BYTES_TOLERANCE = 0.01
+
+
+def synthetic_building(copies, params=Params()):
+    """The model replicated `copies` times on a square grid of blocks.
+
+    Every copy goes through ComponentStore.add exactly as add_3d_wall does, with
+    its own rooms (suffixed " B<k>") and the original floors, so the store grows
+    the same way a larger real building would.
+    """
+    base = build_model(params).components
+    lo, hi = base.lo, base.hi
+    step = hi.max(axis=0) - lo.min(axis=0) + BLOCK_GAP
+    side = math.ceil(math.sqrt(copies))
+    store = ComponentStore(capacity=copies * len(base))
+    colors = [label[0] for label in base.materials.labels]
+    codes = {col: base.codes(col).tolist() for col in ("material", "kind", "room", "floor")}
+    opacity = base.opacity.tolist()
+    for k in range(copies):
+        offset = np.array([k % side * step[0], k // side * step[1], 0.0])
+        suffix = f" B{k}" if k else ""
+        klo, khi = (lo + offset).tolist(), (hi + offset).tolist()
+        for cid, name in enumerate(base.names):
+            store.set_zone(base.rooms.labels[codes["room"][cid]] + suffix, base.floors.labels[codes["floor"][cid]])
+            store.add((klo[cid][0], khi[cid][0]), (klo[cid][1], khi[cid][1]), (klo[cid][2], khi[cid][2]),
+                      name + suffix, colors[codes["material"][cid]], opacity[cid], base.kinds.labels[codes["kind"][cid]])
+    return store
+
+
+# --- Stages ---
+def stage_figure(state):
+    state["figure"] = go.Figure(mesh_traces(state["store"]))
+
+
+def stage_figure_json(state):
+    return measure(state.pop("figure"))[0]
+
+
+def stage_compact(state):
+    state["compact"] = {"data": compact_traces(state["store"]), "layout": {}}
+
+
+def stage_compact_json(state):
+    return measure(state.pop("compact"))[0]
+
+
+def stage_index(state):
+    state["index"] = SearchIndex(state["store"])
+
+
+def stage_search(state):
+    # A fresh copy of the index each run, so neither the query nor the export is a cache hit.
+    state["result"] = state["index"].copy(state["store"]).search("wall")
+
+
+def stage_page(state):
+    state["result"].page(0, 100)
+
+
+def stage_export(state):
+    return len(state["index"].copy(state["store"]).search("wall").export("csv"))
+
+
+def stage_clashes(state):
+    SpatialIndex(state["store"]).clashes()
+
+
+# (name, function) in run order; a stage returning an int reports it as payload bytes.
+STAGES = [
+    ("figure", stage_figure),              # go.Figure of merged Mesh3d traces
+    ("figure_json", stage_figure_json),    # st.plotly_chart serialization of that figure
+    ("compact", stage_compact),            # typed-array traces
+    ("compact_json", stage_compact_json),  # their serialized payload
+    ("index", stage_index),                # Materials page search index
+    ("search", stage_search),              # one query against it
+    ("page", stage_page),                  # the first page of results as a DataFrame
+    ("export", stage_export),              # the same query exported as CSV
+    ("clashes", stage_clashes),            # spatial index build and full clash sweep
+]
+
+
+def run_stage(fn, state, repeat=1):
+    """(best seconds, peak traced bytes, returned value) of one stage.
+
+    Timed runs go without tracemalloc, which slows Python-heavy code several fold;
+    one extra traced run measures the peak.
+    """
+    best, value = math.inf, None
+    for _ in range(repeat):
+        trial = dict(state)
+        start = time.perf_counter()
+        value = fn(trial)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, value
+
+
+def run_scale(copies, params=Params(), repeat=1, log=print):
+    results = {}
+
+    def record(name, fn, state):
+        seconds, peak, value = run_stage(fn, state, repeat)
+        results[name] = {"seconds": round(seconds, 6), "peak_bytes": peak}
+        if isinstance(value, int):
+            results[name]["payload_bytes"] = value
+        log(format_row(copies, name, results[name]))
+
+    state = {}
+    record("build", lambda s: s.__setitem__("store", synthetic_building(copies, params)), state)
+    for name, fn in STAGES:
+        record(name, fn, state)
+    return {"components": len(state["store"]), "stages": results}
+
+
+# --- Regression check ---
+def compare(results, baseline):
+    """List of human-readable regressions of results against a baseline of the same shape."""
+    failures = []
+    for scale, run in results.items():
+        for name, now in run["stages"].items():
+            before = baseline.get(scale, {}).get("stages", {}).get(name)
+            if before is None:
+                continue
+            checks = [("seconds", TIME_TOLERANCE, TIME_FLOOR), ("peak_bytes", MEMORY_TOLERANCE, MEMORY_FLOOR),
+                      ("payload_bytes", BYTES_TOLERANCE, 0)]
+            for key, tolerance, floor in checks:
+                if key in now and key in before:
+                    if now[key] > before[key] * (1 + tolerance) and now[key] - before[key] > floor:
+                        failures.append(f"{scale} {name}: {key} {before[key]} -> {now[key]}")
+    return failures
+
+
+def format_row(copies, name, row):
+    payload = f"{row['payload_bytes'] / 1024:12.1f} KiB" if "payload_bytes" in row else " " * 16
+    return (f"{copies:>6}x {name:<13} {1000 * row['seconds']:10.1f} ms "
+            f"{row['peak_bytes'] / 2 ** 20:10.1f} MiB peak{payload}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time model build, figure serialization and the Materials search at scale.")
+    parser.add_argument("--scales", default="1,10,100,1000", help="comma list of replication factors")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("-o", "--output", help="also write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    # One silent pass first, so no stage is charged for imports or plotly's lazy validators.
+    run_scale(1, log=lambda row: None)
+    results = {}
+    for copies in (int(s) for s in args.scales.split(",")):
+        results[f"{copies}x"] = run_scale(copies, repeat=args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update to create one", file=sys.stderr)
+        return
+    failures = compare(results, json.loads(args.baseline.read_text()))
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
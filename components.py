@@ -0,0 +1,315 @@
+import copy
+
+import numpy as np
+
+from geometry import VERTS_PER_BOX
+
+MIN_THICKNESS = 0.02  # glass panes and other zero-width planes are reported at 2 cm
+
+DIMENSION_COLUMNS = ["Length (m)", "Height (m)", "Thickness (m)", "Area (m²)", "Volume (m³)"]
+TABLE_COLUMNS = ["Component Name", "Kind", "Room", "Floor", "Color"] + DIMENSION_COLUMNS
+
+
+class Categories:
+    """Append-only string <-> code mapping backing a categorical column."""
+
+    def __init__(self):
+        self.labels = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def code(self, label):
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def lookup(self, label):
+        return self._codes.get(label, -1)
+
+    def decode(self, codes):
+        return np.array(self.labels, dtype=object)[codes]
+
+    def copy(self):
+        other = Categories()
+        other.labels, other._codes = list(self.labels), dict(self._codes)
+        return other
+
+
+class Change:
+    """What one edit touched, so renderers and derived quantities can patch instead of rebuild.
+
+    ids are the component ids edited; materials are the merged traces (material
+    codes) whose contents changed; vertex_ranges maps a material code to the
+    (start, stop) vertex slice that moved within that trace. A material listed
+    without a range changed membership and must be rebuilt.
+    """
+
+    def __init__(self, op, ids, materials, vertex_ranges=None):
+        self.op = op
+        self.ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        self.materials = set(materials)
+        self.vertex_ranges = vertex_ranges or {}
+
+    def __repr__(self):
+        return f"Change({self.op!r}, ids={self.ids.tolist()}, materials={sorted(self.materials)}, vertex_ranges={self.vertex_ranges})"
+
+
+class ComponentStore:
+    """Columnar store of axis-aligned components.
+
+    Box corners live in contiguous (n, 3) float arrays; name, color, material,
+    kind, room and floor are integer codes into Categories. Rows are addressed by
+    component id (insertion order) and names resolve to ids through a dict.
+    Deleted rows stay in place, masked out by `alive`, so ids never shift.
+    """
+
+    def __init__(self, capacity=256):
+        self._n = 0
+        self._lo = np.empty((capacity, 3))
+        self._hi = np.empty((capacity, 3))
+        self._opacity = np.empty(capacity)
+        self._alive = np.empty(capacity, dtype=bool)
+        self._codes = {col: np.empty(capacity, dtype=np.int32)
+                       for col in ("color", "material", "kind", "room", "floor")}
+        self.names = []
+        self._index = {}
+        self.colors, self.materials, self.kinds = Categories(), Categories(), Categories()
+        self.rooms, self.floors = Categories(), Categories()
+        self.room, self.floor = "Unassigned", "Ground"
+        self._groups = {}
+        self.version = 0
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, name):
+        return name in self._index
+
+    # --- Construction ---
+    def set_zone(self, room, floor=None):
+        """Tag every component added from now on with this room (and floor)."""
+        self.room = room
+        if floor is not None:
+            self.floor = floor
+
+    def _grow(self):
+        capacity = 2 * len(self._lo)
+        self._lo = np.resize(self._lo, (capacity, 3))
+        self._hi = np.resize(self._hi, (capacity, 3))
+        self._opacity = np.resize(self._opacity, capacity)
+        self._alive = np.resize(self._alive, capacity)
+        self._codes = {col: np.resize(codes, capacity) for col, codes in self._codes.items()}
+
+    def add(self, x_range, y_range, z_range, name, color, opacity, kind="Wall"):
+        if name in self._index:
+            raise ValueError(f"Duplicate component name: {name!r}")
+        if self._n == len(self._lo):
+            self._grow()
+        cid = self._n
+        self._lo[cid] = min(x_range), min(y_range), min(z_range)
+        self._hi[cid] = max(x_range), max(y_range), max(z_range)
+        self._opacity[cid] = opacity
+        self._alive[cid] = True
+        self._codes["color"][cid] = self.colors.code(color)
+        self._codes["material"][cid] = self.materials.code((color, opacity))
+        self._codes["kind"][cid] = self.kinds.code(kind)
+        self._codes["room"][cid] = self.rooms.code(self.room)
+        self._codes["floor"][cid] = self.floors.code(self.floor)
+        self.names.append(name)
+        self._index[name] = cid
+        self._n += 1
+        self._groups.clear()
+        self.version += 1
+        return cid
+
+    def copy(self):
+        """Independent copy for per-session edits of a shared, read-only store."""
+        other = copy.copy(self)
+        other._lo, other._hi = self._lo.copy(), self._hi.copy()
+        other._opacity, other._alive = self._opacity.copy(), self._alive.copy()
+        other._codes = {col: codes.copy() for col, codes in self._codes.items()}
+        other.names, other._index = list(self.names), dict(self._index)
+        for attr in ("colors", "materials", "kinds", "rooms", "floors"):
+            setattr(other, attr, getattr(self, attr).copy())
+        other._groups = dict(self._groups)
+        return other
+
+    # --- Editing ---
+    def _vertex_range(self, cid):
+        material = int(self.codes("material")[cid])
+        pos = int(np.searchsorted(self.groups("material")[material], cid))
+        return material, (pos * VERTS_PER_BOX, (pos + 1) * VERTS_PER_BOX)
+
+    def _set_bounds(self, op, cid, lo, hi):
+        self._lo[cid], self._hi[cid] = np.minimum(lo, hi), np.maximum(lo, hi)
+        self.version += 1
+        material, span = self._vertex_range(cid)
+        return Change(op, cid, [material], {material: span})
+
+    def move(self, name, dx=0.0, dy=0.0, dz=0.0):
+        cid = self.id(name)
+        offset = np.array([dx, dy, dz], dtype=float)
+        return self._set_bounds("move", cid, self._lo[cid] + offset, self._hi[cid] + offset)
+
+    def resize(self, name, x_range=None, y_range=None, z_range=None):
+        """Replace any of the component's axis ranges, keeping the others."""
+        cid = self.id(name)
+        lo, hi = self._lo[cid].copy(), self._hi[cid].copy()
+        for axis, rng in enumerate((x_range, y_range, z_range)):
+            if rng is not None:
+                lo[axis], hi[axis] = min(rng), max(rng)
+        return self._set_bounds("resize", cid, lo, hi)
+
+    def recolor(self, name, color, opacity=None):
+        """Change a component's color (any Plotly color string) and optionally its opacity.
+
+        Raises ValueError, leaving the store untouched, if Plotly would reject either.
+        """
+        from _plotly_utils.basevalidators import ColorValidator
+
+        cid = self.id(name)
+        if ColorValidator.perform_validate_coerce(color) is None:
+            raise ValueError(f"Not a color Plotly understands: {color!r}")
+        if opacity is not None and not 0 <= opacity <= 1:
+            raise ValueError(f"Opacity must be between 0 and 1, got {opacity!r}")
+        before = int(self.codes("material")[cid])
+        opacity = self._opacity[cid] if opacity is None else opacity
+        self._opacity[cid] = opacity
+        self._codes["color"][cid] = self.colors.code(color)
+        self._codes["material"][cid] = after = self.materials.code((color, float(opacity)))
+        self._groups.clear()
+        self.version += 1
+        return Change("recolor", cid, {before, after})
+
+    def delete(self, name):
+        cid = self._index.pop(name)
+        self._alive[cid] = False
+        self._groups.clear()
+        self.version += 1
+        return Change("delete", cid, [int(self.codes("material")[cid])])
+
+    # --- Columns (views, no copies) ---
+    @property
+    def lo(self):
+        return self._lo[:self._n]
+
+    @property
+    def hi(self):
+        return self._hi[:self._n]
+
+    @property
+    def opacity(self):
+        return self._opacity[:self._n]
+
+    @property
+    def alive(self):
+        return self._alive[:self._n]
+
+    def codes(self, column):
+        return self._codes[column][:self._n]
+
+    def categories(self, column):
+        return {"color": self.colors, "material": self.materials, "kind": self.kinds,
+                "room": self.rooms, "floor": self.floors}[column]
+
+    def id(self, name):
+        return self._index[name]
+
+    def get(self, name):
+        cid = self._index[name]
+        return {
+            "name": name,
+            "lo": tuple(self.lo[cid]), "hi": tuple(self.hi[cid]),
+            "color": self.colors.labels[self.codes("color")[cid]],
+            "opacity": float(self.opacity[cid]),
+            "kind": self.kinds.labels[self.codes("kind")[cid]],
+            "room": self.rooms.labels[self.codes("room")[cid]],
+            "floor": self.floors.labels[self.codes("floor")[cid]],
+        }
+
+    # --- Derived columns ---
+    @property
+    def extent(self):
+        return self.hi - self.lo
+
+    @property
+    def length(self):
+        return np.maximum(self.extent[:, 0], self.extent[:, 1])
+
+    @property
+    def thickness(self):
+        t = np.minimum(self.extent[:, 0], self.extent[:, 1])
+        return np.where(t.round(2) == 0, MIN_THICKNESS, t)
+
+    @property
+    def height(self):
+        return self.extent[:, 2]
+
+    @property
+    def area(self):
+        return self.length * self.height
+
+    @property
+    def volume(self):
+        return self.extent.prod(axis=1)
+
+    def groups(self, column="material"):
+        """Component ids per category code, in insertion order within each group. Cached until the next add."""
+        if column not in self._groups:
+            live = np.flatnonzero(self.alive)
+            codes = self.codes(column)[live]
+            order = live[np.argsort(codes, kind="stable")]
+            codes = self.codes(column)
+            bounds = np.searchsorted(codes[order], np.arange(codes.max(initial=-1) + 2))
+            self._groups[column] = {code: order[bounds[code]:bounds[code + 1]]
+                                    for code in range(len(bounds) - 1) if bounds[code] < bounds[code + 1]}
+        return self._groups[column]
+
+    def select(self, **labels):
+        """Sorted ids matching every filter, e.g. select(floor=["First"], room=["Kitchen", "Bathroom Core"]).
+
+        A filter of None means "any". Lookups go through the cached group index,
+        so the cost is proportional to the matches rather than the model.
+        """
+        ids = None
+        for column, wanted in labels.items():
+            if wanted is None:
+                continue
+            groups, cats = self.groups(column), self.categories(column)
+            hits = [groups[code] for code in map(cats.lookup, wanted) if code in groups]
+            part = np.sort(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+            ids = part if ids is None else np.intersect1d(ids, part, assume_unique=True)
+        return np.flatnonzero(self.alive) if ids is None else ids
+
+    def dimensions(self, ids):
+        """DIMENSION_COLUMNS for the given ids, rounded as the table shows them (cm, m², litres)."""
+        ext = self.hi[ids] - self.lo[ids]
+        length = np.maximum(ext[:, 0], ext[:, 1]).round(2)
+        height = ext[:, 2].round(2)
+        thickness = np.minimum(ext[:, 0], ext[:, 1]).round(2)
+        return {
+            "Length (m)": length,
+            "Height (m)": height,
+            "Thickness (m)": np.where(thickness == 0, MIN_THICKNESS, thickness),
+            "Area (m²)": (length * height).round(2),
+            "Volume (m³)": ext.prod(axis=1).round(3),
+        }
+
+    def table_rows(self, ids):
+        """Dimensions-table columns for the given ids, rounded to centimetres."""
+        import pandas as pd
+
+        cat = {col: pd.Categorical.from_codes(self.codes(col)[ids], self.categories(col).labels)
+               for col in ("kind", "room", "floor", "color")}
+        return {
+            "Component Name": [self.names[cid] for cid in ids],
+            "Kind": cat["kind"],
+            "Room": cat["room"],
+            "Floor": cat["floor"],
+            "Color": cat["color"],
+            **self.dimensions(ids),
+        }
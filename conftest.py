@@ -0,0 +1 @@
+# Lets the tests import the top-level modules (model, components, ...) when run from the repo root.
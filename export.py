@@ -0,0 +1,265 @@
+"""Headless mesh export: python export.py model.glb [--set T=0.25 ...]"""
+import argparse
+import colorsys
+import json
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from geometry import FACES_PER_BOX, OUTWARD_FACES, VERTS_PER_BOX, box_faces, box_vertices
+from model import Params, build_model
+
+FORMATS = ("glb", "stl", "obj")
+
+# The CSS named colors, i.e. every name Plotly accepts.
+CSS_COLORS = {
+    "aliceblue": (240, 248, 255), "antiquewhite": (250, 235, 215), "aqua": (0, 255, 255),
+    "aquamarine": (127, 255, 212), "azure": (240, 255, 255), "beige": (245, 245, 220),
+    "bisque": (255, 228, 196), "black": (0, 0, 0), "blanchedalmond": (255, 235, 205), "blue": (0, 0, 255),
+    "blueviolet": (138, 43, 226), "brown": (165, 42, 42), "burlywood": (222, 184, 135),
+    "cadetblue": (95, 158, 160), "chartreuse": (127, 255, 0), "chocolate": (210, 105, 30),
+    "coral": (255, 127, 80), "cornflowerblue": (100, 149, 237), "cornsilk": (255, 248, 220),
+    "crimson": (220, 20, 60), "cyan": (0, 255, 255), "darkblue": (0, 0, 139), "darkcyan": (0, 139, 139),
+    "darkgoldenrod": (184, 134, 11), "darkgray": (169, 169, 169), "darkgreen": (0, 100, 0),
+    "darkgrey": (169, 169, 169), "darkkhaki": (189, 183, 107), "darkmagenta": (139, 0, 139),
+    "darkolivegreen": (85, 107, 47), "darkorange": (255, 140, 0), "darkorchid": (153, 50, 204),
+    "darkred": (139, 0, 0), "darksalmon": (233, 150, 122), "darkseagreen": (143, 188, 143),
+    "darkslateblue": (72, 61, 139), "darkslategray": (47, 79, 79), "darkslategrey": (47, 79, 79),
+    "darkturquoise": (0, 206, 209), "darkviolet": (148, 0, 211), "deeppink": (255, 20, 147),
+    "deepskyblue": (0, 191, 255), "dimgray": (105, 105, 105), "dimgrey": (105, 105, 105),
+    "dodgerblue": (30, 144, 255), "firebrick": (178, 34, 34), "floralwhite": (255, 250, 240),
+    "forestgreen": (34, 139, 34), "fuchsia": (255, 0, 255), "gainsboro": (220, 220, 220),
+    "ghostwhite": (248, 248, 255), "gold": (255, 215, 0), "goldenrod": (218, 165, 32),
+    "gray": (128, 128, 128), "green": (0, 128, 0), "greenyellow": (173, 255, 47), "grey": (128, 128, 128),
+    "honeydew": (240, 255, 240), "hotpink": (255, 105, 180), "indianred": (205, 92, 92),
+    "indigo": (75, 0, 130), "ivory": (255, 255, 240), "khaki": (240, 230, 140), "lavender": (230, 230, 250),
+    "lavenderblush": (255, 240, 245), "lawngreen": (124, 252, 0), "lemonchiffon": (255, 250, 205),
+    "lightblue": (173, 216, 230), "lightcoral": (240, 128, 128), "lightcyan": (224, 255, 255),
+    "lightgoldenrodyellow": (250, 250, 210), "lightgray": (211, 211, 211), "lightgreen": (144, 238, 144),
+    "lightgrey": (211, 211, 211), "lightpink": (255, 182, 193), "lightsalmon": (255, 160, 122),
+    "lightseagreen": (32, 178, 170), "lightskyblue": (135, 206, 250), "lightslategray": (119, 136, 153),
+    "lightslategrey": (119, 136, 153), "lightsteelblue": (176, 196, 222), "lightyellow": (255, 255, 224),
+    "lime": (0, 255, 0), "limegreen": (50, 205, 50), "linen": (250, 240, 230), "magenta": (255, 0, 255),
+    "maroon": (128, 0, 0), "mediumaquamarine": (102, 205, 170), "mediumblue": (0, 0, 205),
+    "mediumorchid": (186, 85, 211), "mediumpurple": (147, 112, 219), "mediumseagreen": (60, 179, 113),
+    "mediumslateblue": (123, 104, 238), "mediumspringgreen": (0, 250, 154),
+    "mediumturquoise": (72, 209, 204), "mediumvioletred": (199, 21, 133), "midnightblue": (25, 25, 112),
+    "mintcream": (245, 255, 250), "mistyrose": (255, 228, 225), "moccasin": (255, 228, 181),
+    "navajowhite": (255, 222, 173), "navy": (0, 0, 128), "oldlace": (253, 245, 230), "olive": (128, 128, 0),
+    "olivedrab": (107, 142, 35), "orange": (255, 165, 0), "orangered": (255, 69, 0),
+    "orchid": (218, 112, 214), "palegoldenrod": (238, 232, 170), "palegreen": (152, 251, 152),
+    "paleturquoise": (175, 238, 238), "palevioletred": (219, 112, 147), "papayawhip": (255, 239, 213),
+    "peachpuff": (255, 218, 185), "peru": (205, 133, 63), "pink": (255, 192, 203), "plum": (221, 160, 221),
+    "powderblue": (176, 224, 230), "purple": (128, 0, 128), "rebeccapurple": (102, 51, 153),
+    "red": (255, 0, 0), "rosybrown": (188, 143, 143), "royalblue": (65, 105, 225),
+    "saddlebrown": (139, 69, 19), "salmon": (250, 128, 114), "sandybrown": (244, 164, 96),
+    "seagreen": (46, 139, 87), "seashell": (255, 245, 238), "sienna": (160, 82, 45),
+    "silver": (192, 192, 192), "skyblue": (135, 206, 235), "slateblue": (106, 90, 205),
+    "slategray": (112, 128, 144), "slategrey": (112, 128, 144), "snow": (255, 250, 250),
+    "springgreen": (0, 255, 127), "steelblue": (70, 130, 180), "tan": (210, 180, 140),
+    "teal": (0, 128, 128), "thistle": (216, 191, 216), "tomato": (255, 99, 71), "turquoise": (64, 224, 208),
+    "violet": (238, 130, 238), "wheat": (245, 222, 179), "white": (255, 255, 255),
+    "whitesmoke": (245, 245, 245), "yellow": (255, 255, 0), "yellowgreen": (154, 205, 50),
+}
+COLOR_FUNCTION = re.compile(r"(rgba?|hsla?|hwb)\((.*)\)")
+
+
+def _channel(part, scale):
+    """One color function argument as a fraction: percentages of 100, others of scale."""
+    if part.endswith("%"):
+        return float(part[:-1]) / 100
+    return float(part.removesuffix("deg")) / scale
+
+
+def color_rgba(color, opacity=1.0):
+    """Plotly color string + trace opacity -> sRGB RGBA floats in [0, 1].
+
+    Colors are checked with the validator ComponentStore.recolor uses. CSS names,
+    hex and rgb(), hsl() and hwb() colors are converted; the other forms Plotly
+    accepts (lab, lch, color(...)) raise ValueError rather than export as a
+    guessed color.
+    """
+    from _plotly_utils.basevalidators import ColorValidator
+
+    if ColorValidator.perform_validate_coerce(color) is None:
+        raise ValueError(f"Not a color Plotly understands: {color!r}")
+    text = color.strip().lower()
+    alpha = 1.0
+    if text in CSS_COLORS:
+        rgb = [c / 255 for c in CSS_COLORS[text]]
+    elif text.startswith("#"):
+        digits = text[1:] if len(text) > 5 else "".join(c * 2 for c in text[1:])
+        values = [int(digits[i:i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+        rgb, alpha = values[:3], (values[3] if len(values) > 3 else 1.0)
+    else:
+        match = COLOR_FUNCTION.fullmatch(text)
+        if match is None:
+            raise ValueError(f"Cannot export {color!r}: use a CSS name or a hex, rgb(), hsl() or hwb() color")
+        kind, args = match.groups()
+        parts = re.split(r"[\s,/]+", args.strip())
+        if len(parts) > 3:
+            alpha = _channel(parts[3], 1)
+        if kind.startswith("rgb"):
+            rgb = [_channel(part, 255) for part in parts[:3]]
+        else:
+            hue, a, b = _channel(parts[0], 360) % 1, _channel(parts[1], 100), _channel(parts[2], 100)
+            if kind.startswith("hsl"):
+                rgb = list(colorsys.hls_to_rgb(hue, b, a))
+            elif a + b >= 1:  # hwb: whiteness and blackness fill the whole range, leaving a gray
+                rgb = [a / (a + b)] * 3
+            else:
+                rgb = list(colorsys.hsv_to_rgb(hue, 1 - a / (1 - b), 1 - b))
+    return [min(max(c, 0.0), 1.0) for c in rgb] + [min(max(alpha, 0.0), 1.0) * opacity]
+
+
+def linear_rgba(rgba):
+    """sRGB RGBA -> linear RGB with alpha unchanged, as glTF's baseColorFactor expects."""
+    rgb = np.asarray(rgba[:3])
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4).tolist() + [rgba[3]]
+
+
+# Every writer exports the live components only; rows deleted by an edit stay in the store.
+
+# --- glTF 2.0 binary ---
+def write_glb(store, path):
+    ids = np.flatnonzero(store.alive)
+    n = len(ids)
+    positions = box_vertices(store.lo[ids], store.hi[ids]).astype("<f4")
+    indices = OUTWARD_FACES.astype("<u2").ravel()
+    index_bytes = indices.tobytes() + b"\0" * (-indices.nbytes % 4)
+    blob = index_bytes + positions.tobytes()
+    vert_stride = VERTS_PER_BOX * 12
+
+    accessors = [{"bufferView": 0, "componentType": 5123, "count": len(indices), "type": "SCALAR"}]
+    accessors += [{"bufferView": 1, "byteOffset": cid * vert_stride, "componentType": 5126,
+                   "count": VERTS_PER_BOX, "type": "VEC3",
+                   "min": lo, "max": hi}
+                  for cid, (lo, hi) in enumerate(zip(positions[0::8].tolist(), positions[6::8].tolist()))]
+    materials = [{"name": f"{color} @ {opacity:g}",
+                  "pbrMetallicRoughness": {"baseColorFactor": rgba, "metallicFactor": 0.0, "roughnessFactor": 0.9},
+                  "alphaMode": "BLEND" if rgba[3] < 1 else "OPAQUE",
+                  "doubleSided": True}
+                 for color, opacity in store.materials.labels
+                 for rgba in [linear_rgba(color_rgba(color, opacity))]]
+    material = store.codes("material")[ids].tolist()
+    meshes = [{"primitives": [{"attributes": {"POSITION": m + 1}, "indices": 0, "material": material[m]}]}
+              for m in range(n)]
+    nodes = [{"name": store.names[cid], "mesh": m} for m, cid in enumerate(ids.tolist())]
+    # The model is Z-up; glTF is Y-up, so a root node rotates it -90° about X.
+    nodes.append({"name": "Building", "rotation": [-0.7071068, 0, 0, 0.7071068], "children": list(range(n))})
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "map export.py"},
+        "scene": 0,
+        "scenes": [{"nodes": [n]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": accessors,
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": indices.nbytes, "target": 34963},
+            {"buffer": 0, "byteOffset": len(index_bytes), "byteLength": positions.nbytes,
+             "byteStride": 12, "target": 34962},
+        ],
+        "buffers": [{"byteLength": len(blob)}],
+    }
+    chunk = json.dumps(gltf, separators=(",", ":")).encode()
+    chunk += b" " * (-len(chunk) % 4)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(chunk) + 8 + len(blob)))
+        f.write(struct.pack("<II", len(chunk), 0x4E4F534A) + chunk)
+        f.write(struct.pack("<II", len(blob), 0x004E4942) + blob)
+
+
+# --- Binary STL ---
+STL_TRIANGLE = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def write_stl(store, path):
+    ids = np.flatnonzero(store.alive)
+    verts = box_vertices(store.lo[ids], store.hi[ids])
+    tris = verts[box_faces(len(ids), OUTWARD_FACES)]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    records = np.zeros(len(tris), dtype=STL_TRIANGLE)
+    records["normal"] = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+    records["vertices"] = tris
+    with open(path, "wb") as f:
+        f.write(b"map export.py binary STL".ljust(80, b"\0"))
+        f.write(struct.pack("<I", len(records)))
+        records.tofile(f)
+
+
+# --- Wavefront OBJ + MTL ---
+def write_obj(store, path):
+    path = Path(path)
+    mtl_path = path.with_suffix(".mtl")
+    ids = np.flatnonzero(store.alive)
+    n = len(ids)
+    verts = box_vertices(store.lo[ids], store.hi[ids])
+    faces = box_faces(n, OUTWARD_FACES) + 1
+    face_lines = ("f %d %d %d\n" * (n * FACES_PER_BOX) % tuple(faces.ravel().tolist())).splitlines(keepends=True)
+    material = store.codes("material")[ids].tolist()
+
+    with open(mtl_path, "w") as f:
+        for code, (color, opacity) in enumerate(store.materials.labels):
+            r, g, b, a = color_rgba(color, opacity)
+            f.write(f"newmtl mat{code}\nKd {r:.4f} {g:.4f} {b:.4f}\nd {a:.4f}\n\n")
+    with open(path, "w") as f:
+        f.write(f"mtllib {mtl_path.name}\n")
+        f.write("v %.4f %.4f %.4f\n" * len(verts) % tuple(verts.ravel().tolist()))
+        for m, cid in enumerate(ids.tolist()):
+            f.write(f"o {store.names[cid]}\nusemtl mat{material[m]}\n")
+            f.writelines(face_lines[m * FACES_PER_BOX:(m + 1) * FACES_PER_BOX])
+
+
+WRITERS = {"glb": write_glb, "stl": write_stl, "obj": write_obj}
+
+
+def export_model(store, path, fmt=None):
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    WRITERS[fmt](store, path)
+    return fmt
+
+
+# --- Command Line ---
+def parse_params(overrides):
+    """Turn ["T=0.25", "CEILING_H=2.7"] into a Params with those fields replaced."""
+    values = Params().as_dict()
+    for item in overrides:
+        key, sep, value = item.partition("=")
+        if not sep or key not in values:
+            raise SystemExit(f"--set expects NAME=VALUE with NAME one of: {', '.join(values)}")
+        values[key] = float(value)
+    return Params(**values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the building model as GLB, STL or OBJ.")
+    parser.add_argument("output", help="output file; the format is taken from its suffix unless --format is given")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a construction constant (repeatable)")
+    args = parser.parse_args(argv)
+
+    fmt = (args.format or Path(args.output).suffix.lstrip(".")).lower()
+    if fmt not in WRITERS:
+        parser.error(f"cannot infer the format from {args.output!r}; pass --format {{{','.join(FORMATS)}}}")
+
+    start = time.perf_counter()
+    store = build_model(parse_params(args.overrides)).components
+    built = time.perf_counter()
+    export_model(store, args.output, fmt)
+    done = time.perf_counter()
+    print(f"{len(store)} components -> {args.output} ({fmt}, {Path(args.output).stat().st_size} bytes); "
+          f"build {1000 * (built - start):.1f} ms, export {1000 * (done - built):.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
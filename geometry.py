@@ -0,0 +1,85 @@
+import numpy as np
+
+# Unit-cube corner order used by every box: bottom ring, then top ring.
+BOX_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=bool)
+
+# 12 triangles per box, as (i, j, k) rows into BOX_CORNERS.
+BOX_FACES = np.array([
+    [7, 3, 0], [0, 4, 7], [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
+    [6, 5, 1], [6, 2, 1], [4, 0, 5], [0, 1, 5], [3, 6, 7], [2, 3, 6],
+], dtype=np.int32)
+
+# The same triangles wound counter-clockwise seen from outside, so every normal points
+# out of the box. Plotly doesn't care; STL and glTF consumers do.
+OUTWARD_FACES = BOX_FACES.copy()
+OUTWARD_FACES[[2, 3, 7, 10]] = OUTWARD_FACES[[2, 3, 7, 10]][:, ::-1]
+
+VERTS_PER_BOX = len(BOX_CORNERS)
+FACES_PER_BOX = len(BOX_FACES)
+
+
+def box_vertices(lo, hi):
+    """Corner coordinates for n boxes, shape (n * 8, 3)."""
+    lo = np.asarray(lo, dtype=float).reshape(-1, 1, 3)
+    hi = np.asarray(hi, dtype=float).reshape(-1, 1, 3)
+    return np.where(BOX_CORNERS, hi, lo).reshape(-1, 3)
+
+
+def box_faces(n, faces=BOX_FACES):
+    """Triangle indices for n consecutive boxes, shape (n * 12, 3)."""
+    offsets = np.arange(n, dtype=np.int32)[:, None, None] * VERTS_PER_BOX
+    return (faces + offsets).reshape(-1, 3)
+
+
+def material_groups(store, ids=None):
+    """Component ids per material code, optionally restricted to a selection."""
+    groups = store.groups("material")
+    if ids is None:
+        return groups
+    keep = np.zeros(len(store), dtype=bool)
+    keep[ids] = True
+    return {code: members[keep[members]] for code, members in groups.items() if keep[members].any()}
+
+
+def material_buffers(store, ids, clip=None):
+    """Vertex and index buffers for a batch of components, cut to the clip box (lo, hi) if given."""
+    lo, hi = store.lo[ids], store.hi[ids]
+    if clip is not None:
+        lo, hi = np.maximum(lo, clip[0]), np.minimum(hi, clip[1])
+    return box_vertices(lo, hi), box_faces(len(ids))
+
+
+def mesh_traces(store, ids=None, clip=None):
+    """One Mesh3d per material; hover resolves the component from its vertex."""
+    import plotly.graph_objects as go
+
+    names = np.array(store.names, dtype=object)
+    traces = []
+    for code, members in material_groups(store, ids).items():
+        color, opacity = store.materials.labels[code]
+        verts, faces = material_buffers(store, members, clip)
+        traces.append(go.Mesh3d(
+            x=verts[:, 0], y=verts[:, 1], z=verts[:, 2],
+            i=faces[:, 0], j=faces[:, 1], k=faces[:, 2],
+            opacity=opacity,
+            color=color,
+            flatshading=True,
+            name=color,
+            text=np.repeat(names[members], VERTS_PER_BOX),
+            hovertemplate="%{text}<extra></extra>",
+        ))
+    return traces
+
+
+def component_at(store, material, vertex=None, face=None, ids=None):
+    """Map a vertex or face index inside a merged trace back to its component id.
+
+    ids is the selection the traces were built from (None for the whole store).
+    """
+    ids = material_groups(store, ids)[material]
+    if face is not None:
+        return int(ids[face // FACES_PER_BOX])
+    return int(ids[vertex // VERTS_PER_BOX])
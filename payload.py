@@ -0,0 +1,172 @@
+"""Compact figure transport: typed-array traces with quantized coordinates and shared index buffers."""
+import base64
+import time
+
+import numpy as np
+
+from geometry import BOX_FACES, FACES_PER_BOX, VERTS_PER_BOX, material_buffers, material_groups
+
+MM = 1000  # fixed-point scale: one unit = 1 mm
+
+
+def typed_array(values, dtype):
+    """Plotly.js typed-array spec ({dtype, bdata}) for a NumPy array."""
+    data = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {"dtype": np.dtype(dtype).str.lstrip("<|"), "bdata": base64.b64encode(data.tobytes()).decode()}
+
+
+def smallest_int(lo, hi, signed=True):
+    for dtype in ((np.int8, np.int16, np.int32) if signed else (np.uint8, np.uint16, np.uint32)):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64 if signed else np.uint64
+
+
+class SharedIndices:
+    """Base64 i/j/k columns for the largest group, sliced per trace.
+
+    Every merged trace uses the same repeating box pattern, so the i/j/k of an
+    n-box trace is a prefix of the longest one. One box's worth of a column is 12
+    indices; at 1, 2 or 4 bytes each that is a multiple of 3 bytes, so the base64
+    text of a prefix is a prefix of the base64 text and can be sliced directly.
+    """
+
+    def __init__(self, max_boxes):
+        self.dtype = smallest_int(0, VERTS_PER_BOX * max_boxes - 1, signed=False)
+        offsets = np.arange(max_boxes)[:, None, None] * VERTS_PER_BOX
+        faces = (BOX_FACES + offsets).reshape(-1, 3)
+        self.columns = [typed_array(faces[:, c], self.dtype) for c in range(3)]
+        self.chars_per_box = FACES_PER_BOX * np.dtype(self.dtype).itemsize * 4 // 3
+
+    def __call__(self, boxes):
+        end = boxes * self.chars_per_box
+        return [{"dtype": col["dtype"], "bdata": col["bdata"][:end]} for col in self.columns]
+
+
+def scene_vertices(store, members, clip=None, quantize=True):
+    """Vertex buffer in scene units: integer millimetres when quantized, metres otherwise."""
+    verts, _ = material_buffers(store, members, clip)
+    return np.rint(verts * MM) if quantize else verts
+
+
+def encode_coords(trace, verts, quantize=True):
+    """(Re)write a trace's x/y/z typed arrays from its vertex buffer."""
+    dtype = smallest_int(verts.min(initial=0), verts.max(initial=0)) if quantize else np.float32
+    for axis, key in enumerate("xyz"):
+        trace[key] = typed_array(verts[:, axis], dtype)
+    return trace
+
+
+def mesh_trace(store, code, members, verts, indices, quantize=True, labels=True):
+    color, opacity = store.materials.labels[code]
+    i, j, k = indices(len(members))
+    trace = {
+        "type": "mesh3d",
+        "i": i, "j": j, "k": k,
+        "opacity": opacity,
+        "color": color,
+        "flatshading": True,
+        "name": color,
+    }
+    if labels:
+        names = [store.names[cid] for cid in members.tolist()]
+        trace.update(text=np.repeat(np.array(names, dtype=object), VERTS_PER_BOX).tolist(),
+                     hovertemplate="%{text}<extra></extra>")
+    else:
+        trace.update(hoverinfo="skip")
+    return encode_coords(trace, verts, quantize)
+
+
+def compact_traces(store, ids=None, quantize=True, labels=True, clip=None):
+    """Mesh3d trace dicts per material, with binary buffers instead of JSON number lists.
+
+    With quantize=True coordinates are integers in millimetres (the scene is then in mm),
+    each trace in the smallest integer type that holds it; otherwise they are float32
+    metres. labels=False drops the per-vertex hover names, which are the largest
+    remaining part of the payload.
+    """
+    groups = material_groups(store, ids)
+    if not groups:
+        return []
+    indices = SharedIndices(max(len(members) for members in groups.values()))
+    return [mesh_trace(store, code, members, scene_vertices(store, members, clip, quantize), indices, quantize, labels)
+            for code, members in groups.items()]
+
+
+class SceneCache:
+    """Trace dicts for one view of a store, patched from components.Change records.
+
+    A move or resize rewrites only the eight vertices of that component in its
+    material's buffer and re-encodes that one trace; recolor and delete rebuild
+    just the materials whose membership changed. Every other trace is reused as is.
+    """
+
+    def __init__(self, store, ids=None, clip=None, quantize=True, labels=True):
+        self.store, self.clip, self.quantize, self.labels = store, clip, quantize, labels
+        self.ids = None if ids is None else np.asarray(ids)
+        self.members, self.verts, self.traces = {}, {}, {}
+        for code in material_groups(store, self.ids):
+            self._build(code)
+
+    def _build(self, code):
+        members = material_groups(self.store, self.ids).get(code)
+        if self.ids is not None and members is not None:
+            # A section-box view keeps only boxes still touching the box after the edit.
+            if self.clip is not None:
+                lo, hi = self.store.lo[members], self.store.hi[members]
+                members = members[np.all((lo <= self.clip[1]) & (hi >= self.clip[0]), axis=1)]
+        if members is None or not len(members):
+            for cache in (self.members, self.verts, self.traces):
+                cache.pop(code, None)
+            return
+        verts = scene_vertices(self.store, members, self.clip, self.quantize)
+        self.members[code], self.verts[code] = members, verts
+        self.traces[code] = mesh_trace(self.store, code, members, verts, SharedIndices(len(members)),
+                                       self.quantize, self.labels)
+
+    def _span(self, code, cid, span):
+        """The edited box's (start, stop) vertex range in this view's trace, or None to rebuild the trace."""
+        if span is None or self.clip is not None:
+            return None
+        if self.ids is None:
+            return span  # vertex_ranges already index the trace of the whole store
+        members = self.members.get(code)
+        pos = int(np.searchsorted(members, cid)) if members is not None else -1
+        if pos < 0 or pos >= len(members) or members[pos] != cid:
+            return None
+        return pos * VERTS_PER_BOX, (pos + 1) * VERTS_PER_BOX
+
+    def apply(self, change):
+        """Patch the cache; returns {material code: (start, stop) vertices or None for a rebuilt trace}.
+
+        An edit to components outside this view leaves it untouched.
+        """
+        if self.ids is not None and not np.isin(change.ids, self.ids).any():
+            return {}
+        patched = {}
+        cid = int(change.ids[0])
+        for code in sorted(change.materials):
+            span = self._span(code, cid, change.vertex_ranges.get(code))
+            if span is None:
+                self._build(code)
+                patched[code] = None
+                continue
+            start, stop = span
+            self.verts[code][start:stop] = scene_vertices(self.store, change.ids[:1], None, self.quantize)
+            encode_coords(self.traces[code], self.verts[code], self.quantize)
+            patched[code] = (start, stop)
+        return patched
+
+    def figure(self, layout):
+        return {"data": [self.traces[code] for code in sorted(self.traces)], "layout": layout}
+
+
+def measure(figure):
+    """(payload bytes, serialization seconds) of a go.Figure or figure dict, via st.plotly_chart's encoding path."""
+    import plotly.io
+    import plotly.tools
+
+    start = time.perf_counter()
+    spec = plotly.io.to_json(plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True), validate=False)
+    return len(spec.encode()), time.perf_counter() - start
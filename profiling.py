@@ -0,0 +1,32 @@
+"""Per-stage wall-clock timing, shared by the app's profiling panel and bench.py."""
+import time
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Records (stage, seconds) in the order stages finish.
+
+    A disabled profiler records nothing, so stages can stay wrapped in
+    production code at the cost of one context manager each.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def total(self):
+        return sum(seconds for _, seconds in self.stages)
+
+    def rows(self):
+        return [{"Stage": name, "ms": round(1000 * seconds, 2)} for name, seconds in self.stages]
@@ -0,0 +1,227 @@
+"""Component search: trigram index over names, attribute filters, paginated results."""
+import io
+import threading
+
+import numpy as np
+
+from components import TABLE_COLUMNS
+
+ATTRIBUTES = ("kind", "room", "floor", "color")
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+CACHE_ENTRIES = 8  # results and exports remembered per index
+
+
+def trigram_postings(texts):
+    """(sorted distinct trigram codes, posting starts, row ids) over the UTF-8 bytes of texts.
+
+    Each trigram is packed into one 24-bit integer, so the whole index is built
+    with array operations: pad the texts into an (n, width) byte matrix, take
+    every window of three, drop windows that run into the padding and keep one
+    (code, row) pair per distinct trigram of a row.
+    """
+    raw = np.array([text.encode() for text in texts], dtype=bytes)
+    width = raw.dtype.itemsize
+    if len(texts) == 0 or width < 3:
+        return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64)
+    mat = raw.view(np.uint8).reshape(len(texts), width).astype(np.int64)
+    codes = mat[:, :-2] << 16 | mat[:, 1:-1] << 8 | mat[:, 2:]
+    valid = mat[:, 2:] != 0
+    rows = np.broadcast_to(np.arange(len(texts))[:, None], codes.shape)[valid]
+    keys = np.sort(codes[valid] * len(texts) + rows)
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+    codes, rows = np.divmod(keys, len(texts))
+    grams, starts = np.unique(codes, return_index=True)
+    return grams, np.append(starts, len(rows)), rows
+
+
+def gram_codes(term):
+    data = term.encode()
+    return [data[i] << 16 | data[i + 1] << 8 | data[i + 2] for i in range(len(data) - 2)]
+
+
+class SearchIndex:
+    """Prebuilt search over a ComponentStore's names, attributes and dimensions.
+
+    Every whitespace-separated word of a query must match. A word matches a
+    component whose name contains it, or whose kind, room, floor or color label
+    contains it. Words of three or more bytes go through the trigram index and
+    are then confirmed against the names; shorter ones have no trigram to look
+    up and are found with one vectorized substring scan. Attributes are matched on their few
+    category labels and expanded through the store's group index. Words, label
+    filters and dimension ranges combine as boolean masks over the store.
+
+    Names never change after a model is built, so the index stays valid through
+    edits: deleted rows are dropped and recolored rows are read from the store
+    at query time, and apply() patches the dimensions of moved or resized rows.
+
+    The app shares one index between every session, so the postings are never
+    written after construction and the small per-query caches only change
+    under a lock.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        texts = [name.lower() for name in store.names]
+        self._raw = np.array([text.encode() for text in texts], dtype=bytes)
+        self._grams, self._starts, self._rows = trigram_postings(texts)
+        self._dims = store.dimensions(np.arange(len(store)))
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._label_text, self._results, self._exports = {}, {}, {}
+
+    def _cached(self, cache, key, build):
+        """cache[key], building it on a miss; keeps at most CACHE_ENTRIES, dropping the oldest.
+
+        build() runs outside the lock, so a slow query doesn't hold up other
+        sessions; two sessions missing on the same key just build it twice.
+        """
+        with self._lock:
+            if key in cache:
+                return cache[key]
+        value = build()
+        with self._lock:
+            while len(cache) >= CACHE_ENTRIES:
+                del cache[next(iter(cache))]
+            cache[key] = value
+        return value
+
+    def _peek(self, cache, key):
+        with self._lock:
+            return cache.get(key)
+
+    def copy(self, store):
+        """This index bound to a per-session copy of its store; postings are shared."""
+        other = SearchIndex.__new__(SearchIndex)
+        other.__dict__.update(self.__dict__)
+        other.store = store
+        other._dims = {column: values.copy() for column, values in self._dims.items()}
+        other._reset()
+        return other
+
+    def apply(self, change):
+        """Patch the dimension columns of the rows a components.Change touched."""
+        for column, values in self.store.dimensions(change.ids).items():
+            self._dims[column][change.ids] = values
+
+    # --- Matching ---
+    def _name_matches(self, term):
+        if len(term.encode()) < 3:
+            return np.flatnonzero(np.char.find(self._raw, term.encode()) >= 0)
+        lists = []
+        for code in set(gram_codes(term)):
+            pos = np.searchsorted(self._grams, code)
+            if pos == len(self._grams) or self._grams[pos] != code:
+                return np.empty(0, dtype=np.int64)
+            lists.append(self._rows[self._starts[pos]:self._starts[pos + 1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            member = np.zeros(len(self._raw), dtype=bool)
+            member[rows] = True
+            candidates = candidates[member[candidates]]
+        if len(gram_codes(term)) == 1:
+            return candidates
+        # Sharing every trigram doesn't make the term a substring, so confirm on the names.
+        return candidates[np.char.find(self._raw[candidates], term.encode()) >= 0]
+
+    def _labels(self, column):
+        """Lower-cased category labels as a byte array, refreshed when an edit adds a label."""
+        labels = self.store.categories(column).labels
+        return self._cached(self._label_text, (column, len(labels)),
+                            lambda: np.array([str(label).lower().encode() for label in labels], dtype=bytes))
+
+    def _attribute_matches(self, term):
+        hits = []
+        for column in ATTRIBUTES:
+            groups = self.store.groups(column)
+            codes = np.flatnonzero(np.char.find(self._labels(column), term.encode()) >= 0)
+            hits += [groups[code] for code in codes.tolist() if code in groups]
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+
+    def _term_mask(self, term):
+        mask = np.zeros(len(self.store), dtype=bool)
+        mask[self._name_matches(term)] = True
+        mask[self._attribute_matches(term)] = True
+        return mask
+
+    def dimensions(self):
+        """Rounded dimension columns for every row, patched by apply() after an edit."""
+        return self._dims
+
+    def bounds(self, column):
+        """(min, max) of a dimension column over the live components."""
+        values = self.dimensions()[column][self.store.alive]
+        return (float(values.min()), float(values.max())) if len(values) else (0.0, 0.0)
+
+    def search(self, text="", ranges=None, **labels):
+        """SearchResult for a query, e.g. search("glass", floor=["First"], ranges={"Height (m)": (2, 3)}).
+
+        labels filter on kind, room, floor or color (None or empty means any);
+        ranges maps dimension columns (components.DIMENSION_COLUMNS) to inclusive (low, high) bounds.
+        """
+        terms = tuple(sorted(set(text.lower().split())))
+        labels = tuple(sorted((col, tuple(wanted)) for col, wanted in labels.items() if wanted))
+        ranges = tuple(sorted((col, (float(lo), float(hi))) for col, (lo, hi) in (ranges or {}).items()))
+        key = (self.store.version, terms, labels, ranges)
+        return self._cached(self._results, key, lambda: self._search(key))
+
+    def _search(self, key):
+        _, terms, labels, ranges = key
+        # Boolean masks over the store: linear with tiny constants, no sorting of large id sets.
+        if labels:
+            mask = np.zeros(len(self.store), dtype=bool)
+            mask[self.store.select(**dict(labels))] = True
+        else:
+            mask = self.store.alive.copy()
+        for term in terms:
+            mask &= self._term_mask(term)
+        dims = self.dimensions()
+        for column, (lo, hi) in ranges:
+            mask &= (dims[column] >= lo) & (dims[column] <= hi)
+        return SearchResult(self, np.flatnonzero(mask), key)
+
+
+class SearchResult:
+    """Sorted ids matching one query. Table rows are built a page at a time."""
+
+    def __init__(self, index, ids, key):
+        self.index, self.ids, self.key = index, ids, key
+
+    def __len__(self):
+        return len(self.ids)
+
+    def page_count(self, size):
+        return max(1, -(-len(self.ids) // size))
+
+    def page(self, number, size):
+        """Dimensions table for page `number` (0-based) of `size` rows, indexed by component id."""
+        import pandas as pd
+
+        ids = self.ids[number * size:(number + 1) * size]
+        return pd.DataFrame(self.index.store.table_rows(ids), index=ids, columns=TABLE_COLUMNS)
+
+    def total(self, column):
+        return float(self.index.dimensions()[column][self.ids].sum())
+
+    def mean(self, column):
+        return float(self.index.dimensions()[column][self.ids].mean()) if len(self.ids) else 0.0
+
+    def exported(self, fmt):
+        """Cached export bytes, or None if export() has not been called for this result and format."""
+        return self.index._peek(self.index._exports, (self.key, fmt))
+
+    def export(self, fmt="csv"):
+        """CSV or Parquet of every matching row, built on first request and then cached."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+        return self.index._cached(self.index._exports, (self.key, fmt), lambda: self._encode(fmt))
+
+    def _encode(self, fmt):
+        df = self.page(0, max(len(self.ids), 1))
+        if fmt == "csv":
+            return df.to_csv(index=False).encode("utf-8")
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        return buffer.getvalue()
@@ -1,6 +1,15 @@
+import time
+
 import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
+import numpy as np
+
+from model import Params, build_model
+from profiling import Profiler
+
+# Page-scoped imports: plotly and the mesh/payload code load with the 3D page,
+# pandas only with the tables, so each page pays only for what it renders.
+
+rerun_start = time.perf_counter()
 
 # --- 1. Page Configuration ---
 st.set_page_config(layout="wide", page_title="Digital Twin")
@@ -21,315 +30,351 @@ st.markdown(hide_st_style, unsafe_allow_html=True)
 
 # --- 3. Navigation Sidebar ---
 st.sidebar.title("Navigation")
-page = st.sidebar.radio("Go to", ["Digital Twin Model", "Materials & Dimensions"])
-
-# --- 4. Data Store Initialization ---
-if 'wall_data' not in st.session_state:
-    st.session_state.wall_data = {}
-
-# --- 5. Enhanced Wall Function ---
-def add_3d_wall(fig, x_range, y_range, z_range, name="Wall", color='firebrick', opacity=0.9):
-    x_min, x_max = min(x_range), max(x_range)
-    y_min, y_max = min(y_range), max(y_range)
-    z_min, z_max = min(z_range), max(z_range)
-    
-    dx = abs(x_max - x_min)
-    dy = abs(y_max - y_min)
-    dz = abs(z_max - z_min)
-    
-    length = round(max(dx, dy), 2)
-    thickness = round(min(dx, dy), 2)
-    if thickness == 0: thickness = 0.02 
-    height = round(dz, 2)
-    
-    st.session_state.wall_data[name] = {
-        "Length (m)": length, 
-        "Height (m)": height, 
-        "Thickness (m)": thickness,
-        "Area (m²)": round(length * height, 2)
+page = st.sidebar.radio("Go to", ["Digital Twin Model", "Materials & Dimensions", "Clash Report"])
+# Opt-in: per-stage timings of this rerun, shown at the bottom of the sidebar.
+prof = Profiler(st.sidebar.toggle("Profile reruns"))
+
+# --- 4. Model Cache ---
+# Built once per set of construction constants and shared read-only by every session.
+@st.cache_resource(show_spinner="Building model...")
+def load_model(params):
+    return build_model(params)
+
+FIGURE_LAYOUT = dict(
+    scene=dict(aspectmode='data', camera=dict(eye=dict(x=-2.2, y=-2.2, z=2.5))),
+    margin=dict(l=0, r=0, b=0, t=50),
+    uirevision="model"  # keeps the camera when traces are patched or filtered
+)
+MM_AXES = dict(xaxis_title="x (mm)", yaxis_title="y (mm)", zaxis_title="z (mm)")
+EDIT_MATCHES = 20  # components offered for editing per search
+
+def select_components(params, view):
+    """Ids for a view of (floors, rooms, section box); None entries mean no filter."""
+    floors, rooms, section = view
+    ids = load_model(params).components.select(floor=floors, room=rooms)
+    if section is not None:
+        ids = np.intersect1d(ids, load_index(params).query_box(*section), assume_unique=True)
+    return ids
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_figure(params, view=(None, None, None)):
+    import plotly.graph_objects as go
+
+    from geometry import mesh_traces
+
+    section = view[2]
+    fig = go.Figure(mesh_traces(load_model(params).components, select_components(params, view), section))
+    fig.update_layout(**FIGURE_LAYOUT)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_compact_figure(params, quantize, labels, view=(None, None, None)):
+    from payload import compact_traces
+
+    layout = dict(FIGURE_LAYOUT, scene=dict(FIGURE_LAYOUT["scene"], **(MM_AXES if quantize else {})))
+    ids, section = select_components(params, view), view[2]
+    traces = compact_traces(load_model(params).components, ids, quantize=quantize, labels=labels, clip=section)
+    return {"data": traces, "layout": layout}
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_payload_stats(params, quantize, labels, view=(None, None, None)):
+    from payload import measure
+
+    return measure(load_figure(params, view)), measure(load_compact_figure(params, quantize, labels, view))
+
+@st.cache_resource(show_spinner="Indexing components...")
+def load_search(params):
+    from search import SearchIndex
+
+    return SearchIndex(load_model(params).components)
+
+@st.cache_resource(show_spinner=False)
+def load_index(params):
+    from spatial import SpatialIndex
+
+    return SpatialIndex(load_model(params).components)
+
+@st.cache_resource(show_spinner="Checking clashes...")
+def load_clashes(params):
+    return load_index(params).clashes()
+
+@st.cache_resource(show_spinner="Computing quantities...")
+def load_takeoff(params):
+    from takeoff import Takeoff
+
+    return Takeoff(load_model(params).components, load_index(params), load_clashes(params))
+
+if st.sidebar.button("Rebuild model"):
+    load_model.clear()
+    load_figure.clear()
+    load_compact_figure.clear()
+    load_payload_stats.clear()
+    load_search.clear()
+    load_index.clear()
+    load_clashes.clear()
+    load_takeoff.clear()
+    st.session_state.pop("edits", None)
+
+params = Params()
+
+# --- 5. Session Edits ---
+# The cached model is shared read-only; the first edit gives this session its own copies,
+# which every later edit patches in place from the Change record it returns. The search
+# index and takeoff are only derived once a page shows them, so editing in 3D stays cheap.
+def apply_edit(params, op, name, **kwargs):
+    """Apply one edit to this session's copies; an invalid edit raises ValueError and changes nothing."""
+    edits = st.session_state.get("edits") or {
+        "store": load_model(params).components.copy(),
+        "takeoff": None,
+        "search": None,
+        "scenes": {},
+        "log": [],
     }
-    
-    fig.add_trace(go.Mesh3d(
-        x=[x_min, x_max, x_max, x_min, x_min, x_max, x_max, x_min],
-        y=[y_min, y_min, y_max, y_max, y_min, y_min, y_max, y_max],
-        z=[z_min, z_min, z_min, z_min, z_max, z_max, z_max, z_max],
-        i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
-        j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
-        k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-        opacity=opacity,
-        color=color,
-        flatshading=True,
-        name=name
-    ))
-
-# --- 6. Constants & Construction Logic ---
-T = 0.22
-CEILING_H = 2.50
-SLAB_TOP = 2.73
-WEST_LIMIT_X = 4.84 + 0.5  
-R3_Y_DIVIDE = 7.72
-R3_Y_END = R3_Y_DIVIDE + 3.35 
-R1_C, R2_C, R3_C, R4_C, R5_C = "royalblue", "firebrick", "darkgreen", "slategrey", "darkorange"
-TAB_C, G_C, G_O = "plum", "skyblue", 0.4
-ENT_C = "rgba(0, 255, 100, 0.4)"
-KITCHEN_C, BATH_C = "lightsalmon", "lightseagreen"
-DOOR_C = "peru"
-
-fig = go.Figure()
-
-# --- BUILDING CONSTRUCTION BLOCKS ---
-# GROUND FLOOR: ROOM 1
-add_3d_wall(fig, [0, WEST_LIMIT_X], [-T, 0], [0, CEILING_H], "R1 North Wall", R1_C)
-add_3d_wall(fig, [-T, 0], [0, 1.15], [0, CEILING_H], "West Pillar 1", R1_C)
-add_3d_wall(fig, [-T, 0], [1.15, 2.11], [2.06, CEILING_H], "West Door Header 1", R1_C)
-add_3d_wall(fig, [-T/2, -T/2], [1.15, 2.11], [0, 2.06], "Entrance 1 Glass", ENT_C)
-add_3d_wall(fig, [-T, 0], [2.11, 5.20], [0, CEILING_H], "West Mid Wall", R1_C)
-add_3d_wall(fig, [-T, 0], [5.20, 6.01], [2.09, CEILING_H], "West Door Header 2", R1_C)
-add_3d_wall(fig, [-T/2, -T/2], [5.20, 6.01], [0, 2.09], "Entrance 2 Glass", ENT_C)
-add_3d_wall(fig, [-T, 0], [6.01, R3_Y_DIVIDE], [0, CEILING_H], "West Pillar 2", R1_C)
-add_3d_wall(fig, [0, 1.96], [R3_Y_DIVIDE, R3_Y_DIVIDE+T], [0, CEILING_H], "R1 South Divider E", R1_C)
-add_3d_wall(fig, [1.96, 2.77], [R3_Y_DIVIDE, R3_Y_DIVIDE+T], [2.09, CEILING_H], "R1 South Door Header", R1_C)
-add_3d_wall(fig, [1.96, 2.77], [R3_Y_DIVIDE+T/2, R3_Y_DIVIDE+T/2], [0, 2.09], "Entrance South Glass", ENT_C)
-add_3d_wall(fig, [2.77, WEST_LIMIT_X], [R3_Y_DIVIDE, R3_Y_DIVIDE+T], [0, CEILING_H], "R1 South Divider W", R1_C)
-
-# PILLARS
-P_DEPTH, P_WIDTH = 0.50, 0.63
-SPAN_START, SPAN_END = -T, R3_Y_END + T
-TOTAL_SPAN_LENGTH = SPAN_END - SPAN_START
-P_X_OUT = WEST_LIMIT_X + P_DEPTH
-gap = (TOTAL_SPAN_LENGTH - (4 * P_WIDTH)) / 3
-pillar_starts = [SPAN_START, SPAN_START + P_WIDTH + gap, SPAN_START + 2 * (P_WIDTH + gap) + 0.43, SPAN_END - P_WIDTH]
-for i, y_start in enumerate(pillar_starts):
-    y_end = y_start + P_WIDTH
-    add_3d_wall(fig, [WEST_LIMIT_X, P_X_OUT], [y_start, y_start+0.02], [0, CEILING_H], f"Hollow P{i+1} S", "gray")
-    add_3d_wall(fig, [P_X_OUT-0.02, P_X_OUT], [y_start, y_end], [0, CEILING_H], f"Hollow P{i+1} W", "gray")
-    add_3d_wall(fig, [WEST_LIMIT_X, P_X_OUT], [y_end-0.02, y_end], [0, CEILING_H], f"Hollow P{i+1} N", "gray")
-
-# WESTERN COLONNADE
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [0, 0.90], [0, CEILING_H], "West Corner Pillar", R1_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [0.90, 2.99], [0, 0.17], "West Curb", R1_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [2.99, 4.53], [0, CEILING_H], "West Mid Pillar", R1_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [7.03, R3_Y_DIVIDE], [0, CEILING_H], "West Corner South", R1_C)
-
-# ROOM 2: EAST WING
-R2_X_END = -1.79
-add_3d_wall(fig, [-0.62, 0], [-T, 0], [0, CEILING_H], "R2 N Pillar", R2_C)
-add_3d_wall(fig, [-1.325, -0.62], [-T, 0], [0, 1.46], "R2 N Sill", R2_C)
-add_3d_wall(fig, [-1.325, -0.62], [-T, 0], [2.06, CEILING_H], "R2 N Header", R2_C)
-add_3d_wall(fig, [-1.325, -0.62], [-T/2, -T/2], [1.46, 2.06], "Glass R2 N", G_C, G_O)
-add_3d_wall(fig, [R2_X_END, -1.325], [-T, 0], [0, CEILING_H], "R2 N End", R2_C)
-add_3d_wall(fig, [R2_X_END-T, R2_X_END], [-T, 2.42], [0, CEILING_H], "R2 East Wall", R2_C)
-add_3d_wall(fig, [R2_X_END, 0], [2.42, 2.42+T], [0, CEILING_H], "R2 South Shared Wall", R2_C)
-
-# ROOM 3: SOUTH WING
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [R3_Y_DIVIDE+0.72, R3_Y_DIVIDE+2.71], [0, 0.86], "R3 W Sill", R3_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [R3_Y_DIVIDE+0.72, R3_Y_DIVIDE+2.71], [2.46, CEILING_H], "R3 W Header", R3_C)
-add_3d_wall(fig, [WEST_LIMIT_X+T/2, WEST_LIMIT_X+T/2], [R3_Y_DIVIDE+0.72, R3_Y_DIVIDE+2.71], [0.86, 2.46], "Glass R3 W", G_C, G_O)
-W_END_X_R3 = WEST_LIMIT_X - 0.35
-W_START_X_R3 = W_END_X_R3 - 1.53
-add_3d_wall(fig, [W_START_X_R3, W_END_X_R3], [R3_Y_END, R3_Y_END+T], [0, 0.43], "R3 S Sill", R3_C)
-add_3d_wall(fig, [W_START_X_R3, W_END_X_R3], [R3_Y_END, R3_Y_END+T], [2.45, CEILING_H], "R3 S Header", R3_C)
-add_3d_wall(fig, [W_START_X_R3, W_END_X_R3], [R3_Y_END+T/2, R3_Y_END+T/2], [0.43, 2.45], "Glass R3 S", G_C, G_O)
-add_3d_wall(fig, [-T, 0], [R3_Y_DIVIDE, R3_Y_END], [0, CEILING_H], "R3 East Shared Wall", R3_C)
-add_3d_wall(fig, [0, W_START_X_R3], [R3_Y_END, R3_Y_END+T], [0, CEILING_H], "R3 S Wall East", R3_C)
-add_3d_wall(fig, [W_END_X_R3, WEST_LIMIT_X], [R3_Y_END, R3_Y_END+T], [0, CEILING_H], "R3 S Wall West", R3_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [R3_Y_DIVIDE, R3_Y_DIVIDE+0.72], [0, CEILING_H], "R3 W Wall N", R3_C)
-add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X+T], [R3_Y_DIVIDE+2.71, R3_Y_END], [0, CEILING_H], "R3 W Wall S", R3_C)
-
-# ROOM 4: MEZZANINE
-R4_X_RIGHT, R4_X_LEFT, R4_Y_TOP, R4_FLOOR, R4_Y_BOT = 0.0, R2_X_END, 2.42, 0.77, 5.0
-add_3d_wall(fig, [R4_X_LEFT, R4_X_RIGHT], [R4_Y_TOP, R4_Y_BOT], [R4_FLOOR, R4_FLOOR+0.05], "R4 Floor", R4_C)
-add_3d_wall(fig, [R4_X_LEFT, R4_X_RIGHT], [R4_Y_TOP, R4_Y_TOP+T], [R4_FLOOR, 2.5], "R4 North Shared Wall", R4_C)
-add_3d_wall(fig, [-T, 0], [R4_Y_TOP, R4_Y_BOT], [R4_FLOOR, 2.5], "R4 West Shared Wall", R4_C)
-add_3d_wall(fig, [R4_X_LEFT-T, R4_X_LEFT], [R4_Y_TOP, R4_Y_BOT], [R4_FLOOR, 2.5], "R4 East Wall", R4_C)
-add_3d_wall(fig, [R4_X_LEFT + 0.82, R4_X_RIGHT], [R4_Y_BOT - T, R4_Y_BOT], [R4_FLOOR, 2.5], "R4 South Wall", R4_C)
-add_3d_wall(fig, [R4_X_LEFT, R4_X_LEFT + 0.82], [R4_Y_BOT - T + T/2, R4_Y_BOT - T + T/2], [R4_FLOOR, 2.5], "R4 Entrance Glass", ENT_C)
-
-# ROOM 5: THE HUB
-R5_XW, R5_XE, R5_YN, R5_YS, R5_Z, R5_CEIL = -T, -3.97, 6.46, R3_Y_END, 0.45, CEILING_H
-add_3d_wall(fig, [R5_XW, R5_XE], [R5_YN, R5_YS], [R5_Z-0.05, R5_Z], "R5 Floor", "tan")
-S_D_X_START, S_D_X_END = R5_XW - 0.49, R5_XW - 0.49 - 0.89
-NW_WIN_Z_SILL, NW_WIN_Z_HEAD = R5_Z + 1.72, R5_Z + 1.72 + 0.29
-NW_X1, NW_X2 = S_D_X_END - 0.335, S_D_X_END - 0.335 - 1.0
-add_3d_wall(fig, [R5_XW, S_D_X_START], [R5_YN, R5_YN+T], [R5_Z, R5_CEIL], "R5 N Wall W", R5_C)
-add_3d_wall(fig, [S_D_X_START, S_D_X_END], [R5_YN, R5_YN+T], [R5_Z+2.03, R5_CEIL], "R5 N Door Header", R5_C)
-add_3d_wall(fig, [S_D_X_START, S_D_X_END], [R5_YN+T/2, R5_YN+T/2], [R5_Z, R5_Z+2.03], "Entrance R5 N Glass", ENT_C)
-add_3d_wall(fig, [S_D_X_END, NW_X1], [R5_YN, R5_YN+T], [R5_Z, R5_CEIL], "R5 N Wall Mid", R5_C)
-add_3d_wall(fig, [NW_X1, NW_X2], [R5_YN, R5_YN+T], [R5_Z, NW_WIN_Z_SILL], "R5 N Win Sill", R5_C)
-add_3d_wall(fig, [NW_X1, NW_X2], [R5_YN, R5_YN+T], [NW_WIN_Z_HEAD, R5_CEIL], "R5 N Win Header", R5_C)
-add_3d_wall(fig, [NW_X2, R5_XE], [R5_YN, R5_YN+T], [R5_Z, R5_CEIL], "R5 N Wall E", R5_C)
-add_3d_wall(fig, [NW_X1, NW_X2], [R5_YN+T/2, R5_YN+T/2], [NW_WIN_Z_SILL, NW_WIN_Z_HEAD], "Glass R5 N", G_C, G_O)
-E_W_Y1, E_W_Y2, E_SILL, E_HEAD = R5_YN + 0.70, R5_YN + 1.68, R5_Z + 1.22, R5_Z + 2.01
-add_3d_wall(fig, [R5_XE, R5_XE+T], [R5_YN, E_W_Y1], [R5_Z, R5_CEIL], "R5 E Wall N", R5_C)
-add_3d_wall(fig, [R5_XE, R5_XE+T], [E_W_Y1, E_W_Y2], [R5_Z, E_SILL], "R5 E Sill", R5_C)
-add_3d_wall(fig, [R5_XE, R5_XE+T], [E_W_Y1, E_W_Y2], [E_SILL, E_HEAD], "R5 E Header", R5_C)
-add_3d_wall(fig, [R5_XE+T/2, R5_XE+T/2], [E_W_Y1, E_W_Y2], [E_SILL, E_HEAD], "Glass R5 E", G_C, G_O)
-add_3d_wall(fig, [R5_XE, R5_XE+T], [E_W_Y2, R5_YS], [R5_Z, R5_CEIL], "R5 E Wall S", R5_C)
-S_X1, S_X2, S_SILL, S_HEAD = R5_XE + 0.36, R5_XE + 1.26, R5_Z + 1.31, R5_Z + 2.03
-add_3d_wall(fig, [R5_XW, S_D_X_START], [R5_YS, R5_YS+T], [R5_Z, R5_CEIL], "R5 S Wall W", R5_C)
-add_3d_wall(fig, [S_D_X_START, S_D_X_END], [R5_YS, R5_YS+T], [R5_Z+2.03, R5_CEIL], "R5 S Door Header", R5_C)
-add_3d_wall(fig, [S_D_X_START, S_D_X_END], [R5_YS+T/2, R5_YS+T/2], [R5_Z, R5_Z+2.03], "Entrance R5 S Glass", ENT_C)
-add_3d_wall(fig, [S_D_X_END, S_X2], [R5_YS, R5_YS+T], [R5_Z, R5_CEIL], "R5 S Wall Mid", R5_C)
-add_3d_wall(fig, [S_X2, S_X1], [R5_YS, R5_YS+T], [R5_Z, S_SILL], "R5 S Win Sill", R5_C)
-add_3d_wall(fig, [S_X2, S_X1], [R5_YS, R5_YS+T], [S_HEAD, R5_CEIL], "R5 S Win Header", R5_C)
-add_3d_wall(fig, [S_X1, R5_XE], [R5_YS, R5_YS+T], [R5_Z, R5_CEIL], "R5 S Wall E", R5_C)
-add_3d_wall(fig, [S_X2, S_X1], [R5_YS+T/2, R5_YS+T/2], [S_SILL, S_HEAD], "Glass R5 S", G_C, G_O)
-
-# STAIRS
-curr_z, curr_x = 0.32, -1.1
-y_f1_start, y_f1_end = 5.0, 6.4
-f1_steps = [(0.19, 0.24), (0.21, 0.4), (0.19, 0.4), (0.18, 0.39), (0.18, 0.39), (0.18, 0.4), (0.18, 0.4), (0.18, 0.415)]
-for i, (r, d) in enumerate(f1_steps):
-    add_3d_wall(fig, [curr_x - d, curr_x], [y_f1_start, y_f1_end], [0, curr_z + r], f"Stair F1_{i+1}", "silver")
-    curr_z += r; curr_x -= d
-add_3d_wall(fig, [curr_x - 1.3, curr_x], [y_f1_start - 1.5, y_f1_end], [0, 1.81], "Mid Landing", "darkgray")
-y_f2_s, y_f2_e, cz2, cx2 = y_f1_start - 1.62, y_f1_start - 0.22, 1.81, curr_x - 1.3
-for i in range(6):
-    add_3d_wall(fig, [cx2, cx2 + 0.5], [y_f2_s, y_f2_e], [0, cz2 + 0.153], f"Stair F2_{i+1}", "silver")
-    cz2 += 0.153; cx2 += 0.5
-add_3d_wall(fig, [cx2, 0], [y_f2_s, y_f2_e], [SLAB_TOP - 0.05, SLAB_TOP], "FF Arrival", "silver")
-
-# SLABS
-SL_N, SL_S = -T, R3_Y_END + T
-add_3d_wall(fig, [0, WEST_LIMIT_X], [SL_N, SL_S], [CEILING_H, SLAB_TOP], "Slab West", "rgba(100,100,100,0.5)")
-add_3d_wall(fig, [R2_X_END, 0], [SL_N, 2.42 + T], [CEILING_H, SLAB_TOP], "Slab NE", "rgba(100,100,100,0.5)")
-add_3d_wall(fig, [R5_XE, 0], [R5_YN - 0.2, SL_S], [CEILING_H, SLAB_TOP], "Slab SE", "rgba(100,100,100,0.5)")
-
-# FIRST FLOOR
-TAB_ZS, TAB_ZE = SLAB_TOP, SLAB_TOP + 2.50
-ROOM_W = (SL_S - SL_N) / 4
-TAB_C_STRONG = "#9932CC"
-for i in range(4):
-    ymin = SL_N + i * ROOM_W
-    ymax = SL_N + (i + 1) * ROOM_W
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin, ymin + 0.5], [TAB_ZS, TAB_ZE], f"FF W-Wall {i+1}a", TAB_C_STRONG)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 0.5, ymin + 1.4], [TAB_ZS, TAB_ZS + 2.1], f"Balc Door {i+1}", DOOR_C)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 0.5, ymin + 1.4], [TAB_ZS + 2.1, TAB_ZE], f"Balc Door {i+1} Header", TAB_C_STRONG)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 1.4, ymin + 1.6], [TAB_ZS, TAB_ZE], f"FF W-Wall {i+1}b", TAB_C_STRONG)
-    add_3d_wall(fig, [WEST_LIMIT_X + T/2, WEST_LIMIT_X + T/2], [ymin + 1.6, ymin + 2.5], [TAB_ZS + 1.0, TAB_ZS + 2.0], f"FF Window {i+1}", G_C, G_O)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 1.6, ymin + 2.5], [TAB_ZS, TAB_ZS + 1.0], f"FF W-Sill {i+1}", TAB_C_STRONG)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 1.6, ymin + 2.5], [TAB_ZS + 2.0, TAB_ZE], f"FF W-Header {i+1}", TAB_C_STRONG)
-    add_3d_wall(fig, [WEST_LIMIT_X, WEST_LIMIT_X + T], [ymin + 2.5, ymax], [TAB_ZS, TAB_ZE], f"FF W-Wall {i+1}c", TAB_C_STRONG)
-    y_pos = SL_N + i * ROOM_W
-    add_3d_wall(fig, [WEST_LIMIT_X - 3.5, WEST_LIMIT_X], [y_pos, y_pos + T], [TAB_ZS, TAB_ZE], f"FF Divider {i+1}", TAB_C_STRONG)
-
-# --- UPDATED SERVICE CORE ALIGNMENT (Stacked over Ground Floor x=0) ---
-
-# 1. FF EXTRA WALL (Stacked over Ground Floor x=0)
-add_3d_wall(fig, [-0.22, -0.22 + T], [5.0, 6.45], [TAB_ZS, TAB_ZE], "FF Extra Wall Aligned", TAB_C)
-
-# 2. KITCHEN (East side aligned to x=0)
-K_XW, K_XE, K_YN, K_YS = 0.0, -2.0, 5.0, -0.22 
-OP_S, OP_E = 3.38, 4.78
-add_3d_wall(fig, [K_XE, K_XW], [K_YN - T, K_YN], [TAB_ZS, TAB_ZE], "FF Kitchen South Wall", KITCHEN_C)
-add_3d_wall(fig, [K_XW - T, K_XW], [K_YS, OP_S], [TAB_ZS, TAB_ZE], "FF Kitchen East-South", KITCHEN_C)
-add_3d_wall(fig, [K_XW - T, K_XW], [OP_E, K_YN], [TAB_ZS, TAB_ZE], "FF Kitchen East-North", KITCHEN_C)
-add_3d_wall(fig, [K_XE, K_XE + T], [K_YS, OP_S], [TAB_ZS, TAB_ZE], "FF Kitchen West-South", KITCHEN_C)
-add_3d_wall(fig, [K_XE, K_XE + T], [OP_E, K_YN], [TAB_ZS, TAB_ZE], "FF Kitchen West-North", KITCHEN_C)
-
-# 3. BATHROOM COMPLEX (East wall aligned to x=0)
-BX_0, BX_W, BY_N, BY_S = 0.0, -3.97, 11.29, 6.46 
-
-# ── External Shell (original + reinforced clarity) ───────────────────────────
-add_3d_wall(fig, [BX_W, BX_0],       [BY_N - T, BY_N],     [TAB_ZS, TAB_ZE], "BATH North Outer Wall",          BATH_C)
-add_3d_wall(fig, [BX_W, BX_0],       [BY_S,     BY_S + T], [TAB_ZS, TAB_ZE], "BATH South Outer Wall",          BATH_C)
-add_3d_wall(fig, [BX_W, BX_W + T],   [BY_S,     BY_N],     [TAB_ZS, TAB_ZE], "BATH West Outer Wall",           BATH_C)
-add_3d_wall(fig, [BX_0 - T, BX_0],   [BY_S,     BY_N],     [TAB_ZS, TAB_ZE], "BATH East Outer Wall Aligned",   BATH_C)
-
-# ── NEW: Hallway / Passage end closures ──────────────────────────────────────
-# North end wall — closes the passage at the very north
-add_3d_wall(fig, [BX_W, BX_0], [BY_N, BY_N + T], [TAB_ZS, TAB_ZE],
-            "Hall North Closure Wall", C_WALL if 'C_WALL' in globals() else "dimgray")
-
-# South end wall — closes below kitchen / entrance side
-add_3d_wall(fig, [BX_W, BX_0], [BY_S - T, BY_S], [TAB_ZS, TAB_ZE],
-            "Hall South Closure Wall", C_WALL if 'C_WALL' in globals() else "dimgray")
-
-# ── NEW: Windows on EAST façade for hallway daylight (≈1.2–1.4 m wide) ────────
-# Positioned roughly in lower, middle, upper parts of the circulation zone
-win_width  = 1.3
-win_sill   = TAB_ZS + 1.10
-win_height = 1.40
-
-# Window 1 — southern part (near entrance/privacy screen)
-add_3d_wall(fig, [BX_W - T/2, BX_W + T/2], [BY_S + 1.2, BY_S + 1.2 + win_width], [win_sill, win_sill + win_height],
-            "Hall East Window South", G_C, G_O)
-
-# Window 2 — central hallway zone
-add_3d_wall(fig, [BX_W - T/2, BX_W + T/2], [BY_S + 3.0, BY_S + 3.0 + win_width], [win_sill, win_sill + win_height],
-            "Hall East Window Center", G_C, G_O)
-
-# Window 3 — northern part (near showers)
-add_3d_wall(fig, [BX_W - T/2, BX_W + T/2], [BY_N - 2.2, BY_N - 2.2 + win_width], [win_sill, win_sill + win_height],
-            "Hall East Window North", G_C, G_O)
-
-# ── Central Vanity (unchanged) ───────────────────────────────────────────────
-add_3d_wall(fig, [BX_W + 1.0, BX_0 - 1.0], [BY_S + 2.0, BY_S + 2.6], [TAB_ZS, TAB_ZS + 0.9], "BATH Central Vanity", "sandybrown")
-
-# Toilet Area (3 Stalls) ──────────────────────────────────────────────────────
-stall_depth = 1.5
-for i in range(3):
-    y_stall = BY_S + T + (i * 1.1)
-    add_3d_wall(fig, [BX_W + T, BX_W + T + stall_depth], [y_stall, y_stall + 0.05], [TAB_ZS, TAB_ZE], f"WC Stall {i+1} Partition", BATH_C, 0.7)
-    if (i + 1) != 3:
-        add_3d_wall(fig, [BX_W + T + stall_depth, BX_W + T + stall_depth], [y_stall + 0.1, y_stall + 1.0], [TAB_ZS, TAB_ZS + 2.1], f"WC Door {i+1}", DOOR_C)
-
-# Shower Area (unchanged) ─────────────────────────────────────────────────────
-for i in range(3):
-    x_sh = BX_0 - T - (i * 1.2)
-    add_3d_wall(fig, [x_sh, x_sh - 0.05], [BY_N - T - 1.5, BY_N - T], [TAB_ZS, TAB_ZE], f"SH Stall {i+1} Partition", "lightblue", 0.5)
-    add_3d_wall(fig, [x_sh, x_sh - 1.2], [BY_N - T - 1.5, BY_N - T - 1.5], [TAB_ZS, TAB_ZS + 2.0], f"SH Glass {i+1}", G_C, 0.3)
-
-# Entrance & Privacy (unchanged) ──────────────────────────────────────────────
-add_3d_wall(fig, [BX_0 - T, BX_0], [BY_S + 0.5, BY_S + 1.5], [TAB_ZS, TAB_ZS + 2.1], "BATH Entrance Door", DOOR_C)
-add_3d_wall(fig, [BX_0 - 1.5, BX_0 - T], [BY_S + 1.8, BY_S + 1.85], [TAB_ZS, TAB_ZE], "BATH Privacy Screen", BATH_C)
-
-# ── Aligned East Doors (Residential Units) ──────────────
-EAST_WALL_X = 1.84
-for i in range(4):
-    ymin = SL_N + i * ROOM_W
-    door_y_start, door_y_end = ymin + 0.5, ymin + 1.4
-    ymax = SL_N + (i + 1) * ROOM_W
-    add_3d_wall(fig, [EAST_WALL_X, EAST_WALL_X + T], [ymin, door_y_start], [TAB_ZS, TAB_ZE], f"FF E-Wall {i+1}a", TAB_C_STRONG)
-    add_3d_wall(fig, [EAST_WALL_X, EAST_WALL_X + T], [door_y_start, door_y_end], [TAB_ZS, TAB_ZS + 2.1], f"FF Door {i+1}", DOOR_C)
-    add_3d_wall(fig, [EAST_WALL_X, EAST_WALL_X + T], [door_y_start, door_y_end], [TAB_ZS + 2.1, TAB_ZE], f"FF Door {i+1} Header", TAB_C_STRONG)
-    add_3d_wall(fig, [EAST_WALL_X, EAST_WALL_X + T], [door_y_end, ymax], [TAB_ZS, TAB_ZE], f"FF E-Wall {i+1}b", TAB_C_STRONG)
-
-# ── Perimeters & Balconies ──────────────────────────
-for i in range(4):
-    ymin, ymax = SL_N + (i * ROOM_W), SL_N + ((i + 1) * ROOM_W)
-    add_3d_wall(fig, [WEST_LIMIT_X + T, WEST_LIMIT_X + T + 1.0], [ymin, ymax], [TAB_ZS, TAB_ZS + 0.1], f"Balcony {i+1}", "grey")
-    add_3d_wall(fig, [WEST_LIMIT_X + T + 1.0, WEST_LIMIT_X + T + 1.05], [ymin, ymax], [TAB_ZS, TAB_ZS + 1.1], f"Rail {i+1}", "black", 0.5)
-
-add_3d_wall(fig, [R2_X_END, WEST_LIMIT_X], [SL_N, SL_N+T], [TAB_ZS, TAB_ZE], "FF North Perimeter", TAB_C_STRONG)
-add_3d_wall(fig, [BX_W, WEST_LIMIT_X], [SL_S-T, SL_S], [TAB_ZS, TAB_ZE], "FF South Perimeter", TAB_C_STRONG)
-add_3d_wall(fig, [BX_W-T, BX_W], [BY_S, SL_S], [TAB_ZS, TAB_ZE], "FF East Perimeter Hub Side", TAB_C_STRONG)
-
-# --- 7. Page Rendering Logic ---
+    store = edits["store"]
+    change = getattr(store, op)(name, **kwargs)
+    st.session_state.edits = edits
+    if edits["takeoff"] is not None:
+        edits["takeoff"].apply(change)
+    if edits["search"] is not None:
+        edits["search"].apply(change)
+    patched = {key: scene.apply(change) for key, scene in edits["scenes"].items()}
+    edits["log"].append(change)
+    return change, patched
+
+def session_search(params):
+    edits = st.session_state.edits
+    if edits["search"] is None:
+        index = edits["search"] = load_search(params).copy(edits["store"])
+        for change in edits["log"]:
+            index.apply(change)
+    return edits["search"]
+
+def session_takeoff():
+    from takeoff import Takeoff
+
+    edits = st.session_state.edits
+    if edits["takeoff"] is None:
+        edits["takeoff"] = Takeoff(edits["store"])
+    return edits["takeoff"]
+
+def session_scene(store, view, quantize, labels):
+    from payload import SceneCache
+
+    scenes = st.session_state.edits["scenes"]
+    key = (view, quantize, labels)
+    if key not in scenes:
+        floors, rooms, section = view
+        ids = store.select(floor=floors, room=rooms)
+        if section is not None:
+            lo, hi = np.array(section[0]), np.array(section[1])
+            ids = ids[np.all((store.lo[ids] <= hi) & (store.hi[ids] >= lo), axis=1)]
+        while len(scenes) >= 8:
+            scenes.pop(next(iter(scenes)))
+        scenes[key] = SceneCache(store, ids, section, quantize, labels)
+    return scenes[key]
+
+# --- 6. Page Rendering Logic ---
 if page == "Digital Twin Model":
     st.title("Digital Twin: Vertical Alignment Applied")
-    fig.update_layout(
-        scene=dict(aspectmode='data', camera=dict(eye=dict(x=-2.2, y=-2.2, z=2.5))),
-        margin=dict(l=0, r=0, b=0, t=50)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    edits = st.session_state.get("edits")
+    with prof.stage("model"):
+        store = edits["store"] if edits else load_model(params).components
+    st.sidebar.subheader("View")
+    floors = st.sidebar.multiselect("Floors", store.floors.labels, placeholder="All floors")
+    rooms = st.sidebar.multiselect("Rooms", store.rooms.labels, placeholder="All rooms")
+    section = None
+    if st.sidebar.toggle("Section box"):
+        lo, hi = store.lo.min(axis=0), store.hi.max(axis=0)
+        ranges = [st.sidebar.slider(f"{axis} range (m)", float(lo[n]), float(hi[n]), (float(lo[n]), float(hi[n])), 0.05)
+                  for n, axis in enumerate("xyz")]
+        section = tuple(zip(*ranges))
+    view = (tuple(floors) or None, tuple(rooms) or None, section)
+
+    # An edited scene is always the compact one, patched in place, so the transport choices are fixed.
+    compact = not edits and st.sidebar.toggle("Compact transport", value=True)
+    quantize = (edits or compact) and st.sidebar.toggle("Quantize to millimetres", value=True)
+    labels = not (edits or compact) or st.sidebar.toggle("Hover labels", value=True)
+    # Measuring the standard figure means building and serializing it, so only on request.
+    compare = compact and st.sidebar.toggle("Compare with standard payload")
+    if edits:
+        st.sidebar.caption("Edited models always use the compact transport.")
+
+    with st.expander("✏️ Edit component"):
+        # Found through the search index rather than a list of every name, which at large
+        # scale would ship megabytes of options on each rerun.
+        query = st.text_input("Find component", placeholder="Type part of a name, e.g. north wall")
+        matches = []
+        if query:
+            index = session_search(params) if edits else load_search(params)
+            matches = [store.names[cid] for cid in index.search(query).ids[:EDIT_MATCHES].tolist()]
+            if not matches:
+                st.caption("No component matches.")
+        name = st.selectbox("Component", matches) if matches else None
+        if name is not None:
+            op = st.radio("Operation", ["Move", "Resize", "Recolor", "Delete"], horizontal=True)
+            current = store.get(name)
+            kwargs = {}
+            if op == "Move":
+                cols = st.columns(3)
+                kwargs = {f"d{axis}": cols[n].number_input(f"Δ{axis} (m)", value=0.0, step=0.05, format="%.3f")
+                          for n, axis in enumerate("xyz")}
+            elif op == "Resize":
+                cols = st.columns(3)
+                for n, axis in enumerate("xyz"):
+                    lo = cols[n].number_input(f"{axis} min (m)", value=current["lo"][n], step=0.05, format="%.3f")
+                    hi = cols[n].number_input(f"{axis} max (m)", value=current["hi"][n], step=0.05, format="%.3f")
+                    kwargs[f"{axis}_range"] = (lo, hi)
+            elif op == "Recolor":
+                cols = st.columns(2)
+                kwargs = {"color": cols[0].text_input("Color", value=current["color"]),
+                          "opacity": cols[1].slider("Opacity", 0.0, 1.0, current["opacity"], 0.05)}
+            if st.button("Apply"):
+                try:
+                    change, patched = apply_edit(params, op.lower(), name, **kwargs)
+                except ValueError as err:
+                    st.error(str(err))
+                else:
+                    edits = st.session_state.edits
+                    store = edits["store"]
+                    spans = [f"material {code}: " + ("rebuilt" if span is None else f"vertices {span[0]}–{span[1]}")
+                             for scene in patched.values() for code, span in scene.items()]
+                    st.caption(f"{change.op} {name} → " + ("; ".join(spans) or ("outside every open view" if patched else "session copy created")))
+        if edits:
+            st.caption(f"{len(edits['log'])} edit(s) in this session")
+            if st.button("Discard edits"):
+                st.session_state.pop("edits")
+                st.rerun()
+
+    if edits:
+        layout = dict(FIGURE_LAYOUT, scene=dict(FIGURE_LAYOUT["scene"], **(MM_AXES if quantize else {})))
+        with prof.stage("figure"):
+            scene = session_scene(store, view, quantize, labels)
+            fig = scene.figure(layout)
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, key="twin")
+        st.caption(f"{sum(len(m) for m in scene.members.values())} of {int(store.alive.sum())} components · "
+                   f"{len(scene.traces)} traces, patched in place on each edit")
+    elif compact:
+        with prof.stage("figure"):
+            fig = load_compact_figure(params, quantize, labels, view)
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, key="twin")
+        caption = f"{len(select_components(params, view))} of {len(store)} components"
+        if compare:
+            with prof.stage("payload stats"):
+                (std_bytes, std_s), (bytes_, secs) = load_payload_stats(params, quantize, labels, view)
+            caption += (f" · payload {bytes_ / 1024:.1f} KiB in {secs * 1000:.1f} ms "
+                        f"(standard {std_bytes / 1024:.1f} KiB in {std_s * 1000:.1f} ms, {std_bytes / bytes_:.1f}x smaller)")
+        st.caption(caption)
+    else:
+        with prof.stage("figure"):
+            fig = load_figure(params, view)
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, key="twin")
 
 elif page == "Materials & Dimensions":
+    from search import ATTRIBUTES, EXPORT_FORMATS
+
     st.title("🧱 Materials & Wall Dimensions")
-    df = pd.DataFrame.from_dict(st.session_state.wall_data, orient='index')
-    df.index.name = 'Component Name'
-    df.reset_index(inplace=True)
+    edits = st.session_state.get("edits")
+    with prof.stage("index"):
+        index = session_search(params) if edits else load_search(params)
+    store = index.store
+    
+    search_query = st.text_input("🔍 Search for a component",
+                                 help="Every word must appear in the name, kind, room, floor or color.")
+    with st.expander("Filters"):
+        cols = st.columns(4)
+        labels = {column: cols[n].multiselect(column.title(), store.categories(column).labels)
+                  for n, column in enumerate(ATTRIBUTES)}
+        ranges = {}
+        cols = st.columns(3)
+        for n, column in enumerate(["Length (m)", "Height (m)", "Area (m²)"]):
+            lo, hi = index.bounds(column)
+            if lo < hi:
+                picked = cols[n].slider(column, lo, hi, (lo, hi), 0.01)
+                if picked != (lo, hi):
+                    ranges[column] = picked
+    with prof.stage("search"):
+        result = index.search(search_query, ranges=ranges, **labels)
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Components", len(result))
+    col2.metric("Surface Area", f"{result.total('Area (m²)'):.2f} m²")
+    col3.metric("Avg Height", f"{result.mean('Height (m)'):.2f} m")
     
-    search_query = st.text_input("🔍 Search for a component")
-    if search_query:
-        df = df[df['Component Name'].str.contains(search_query, case=False)]
+    # Only the visible page is turned into table rows and sent to the browser.
+    cols = st.columns([1, 1, 4])
+    size = cols[0].selectbox("Rows per page", [50, 100, 250, 500], index=1)
+    pages = result.page_count(size)
+    number = cols[1].number_input(f"Page (of {pages})", 1, pages, 1)
+    with prof.stage("dataframe"):
+        st.dataframe(result.page(number - 1, size), use_container_width=True, hide_index=True)
+    st.caption(f"Rows {min((number - 1) * size + 1, len(result))}–{min(number * size, len(result))} of {len(result)}")
     
+    # Exports are built on request and cached per query, then offered for download.
+    cols = st.columns([1, 1, 4])
+    choice = cols[0].radio("Export as", ["CSV", "Parquet"], horizontal=True)
+    fmt = choice.lower()
+    data = result.exported(fmt)
+    if data is None and cols[1].button("Prepare export"):
+        with prof.stage("export"):
+            data = result.export(fmt)
+    if data is not None:
+        cols[1].download_button(f"📥 Download {choice}", data, f"materials.{fmt}", EXPORT_FORMATS[fmt])
+
+    st.subheader("📐 Quantity Takeoff")
+    with prof.stage("takeoff"):
+        takeoff = session_takeoff() if edits else load_takeoff(params)
+        totals = takeoff.totals()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Net Wall Area", f"{totals['Net Wall Area (m²)']:.2f} m²")
+    col2.metric("Openings Deducted", f"{totals['Openings (m²)']:.2f} m²")
+    col3.metric("Glazing Area", f"{totals['Glazing Area (m²)']:.2f} m²")
+    col4.metric("Concrete/Masonry", f"{totals['Concrete/Masonry Volume (m³)']:.2f} m³")
+    group_by = st.radio("Group by", ["Room", "Floor", "Color", "Kind"], horizontal=True)
+    st.dataframe(takeoff.to_frame(group_by.lower()), use_container_width=True)
+
+elif page == "Clash Report":
+    st.title("💥 Clash Report")
+    edits = st.session_state.get("edits")
+    with prof.stage("clashes"):
+        if edits:
+            if edits.get("clashes", (None,))[0] != edits["store"].version:
+                from spatial import SpatialIndex
+
+                edits["clashes"] = (edits["store"].version, SpatialIndex(edits["store"]).clashes())
+            report = edits["clashes"][1]
+        else:
+            report = load_clashes(params)
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Components", len(df))
-    col2.metric("Surface Area", f"{df['Area (m²)'].sum():.2f} m²")
-    col3.metric("Avg Height", f"{df['Height (m)'].mean():.2f} m")
+    col1.metric("Clashing Pairs", len(report))
+    col2.metric("Components Involved", len(set(report.a) | set(report.b)))
+    col3.metric("Intersection Volume", f"{report.volume.sum():.3f} m³")
     
+    with prof.stage("table"):
+        df = report.to_frame()
+    focus = st.selectbox("Filter by component", ["All"] + sorted(set(df["Component A"]) | set(df["Component B"])))
+    if focus != "All":
+        df = df[(df["Component A"] == focus) | (df["Component B"] == focus)]
     st.dataframe(df, use_container_width=True, height=600)
-    csv = df.to_csv(index=False).encode('utf-8')
-    st.download_button("📥 Download CSV", csv, "materials.csv", "text/csv")
 
+# --- 7. Profiling Panel ---
+# Rendered as markdown rather than st.dataframe so profiling never pulls pandas into a page.
+def markdown_table(rows, columns):
+    lines = ["| " + " | ".join(columns) + " |", "|" + " --- |" * len(columns)]
+    lines += ["| " + " | ".join(str(row.get(col, "")) for col in columns) + " |" for row in rows]
+    return "\n".join(lines)
+
+if prof.enabled:
+    elapsed = time.perf_counter() - rerun_start
+    history = st.session_state.setdefault("profile_history", [])
+    history.append({"page": page, **{name: round(1000 * secs, 2) for name, secs in prof.stages},
+                    "total": round(1000 * elapsed, 2)})
+    del history[:-20]
+    with st.sidebar.expander("⏱️ Rerun profile", expanded=True):
+        st.caption(f"{page}: {1000 * elapsed:.1f} ms this rerun, {1000 * prof.total():.1f} ms in timed stages")
+        st.markdown(markdown_table(prof.rows(), ["Stage", "ms"]))
+        st.caption("Last reruns (ms)")
+        stages = dict.fromkeys(key for row in history for key in row if key not in ("page", "total"))
+        st.markdown(markdown_table(history[::-1], ["page", *stages, "total"]))
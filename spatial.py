@@ -0,0 +1,197 @@
+import numpy as np
+
+CLASH_TOLERANCE = 1e-3  # boxes must interpenetrate by more than 1 mm to count as a clash
+PAIR_CHUNK = 1 << 20    # candidate pairs tested per vectorized batch
+STRIP_WIDTH = 1         # clash sweep strip width, in 99th-percentile box extents across the strips
+
+
+class SpatialIndex:
+    """Sweep-and-prune index over the axis-aligned boxes of a ComponentStore.
+
+    Boxes are sorted by their lower bound on the axis where they are most spread
+    out. Range queries binary-search that axis and filter the short candidate run
+    on all three axes; the few outsized boxes (slabs, long perimeters) that would
+    widen every search window are kept aside and always tested. The clash sweep
+    also cuts the model into strips across the next most spread axis, since a
+    window along one axis of a grid of buildings spans every row of the grid.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        live = np.flatnonzero(store.alive)
+        lo, hi = store.lo, store.hi
+        extent = hi[live] - lo[live]
+        centre = (lo[live] + hi[live]) / 2
+        spread = centre.max(axis=0, initial=0) - centre.min(axis=0, initial=0)
+        ratio = spread / (np.median(extent, axis=0) + 1e-9) if len(live) else np.zeros(3)
+        self.axis, self.cross_axis = (int(ax) for ax in np.argsort(-ratio, kind="stable")[:2])
+        self.window = np.percentile(extent[:, self.axis], 99) if len(live) else 0.0
+        self.strip = max(STRIP_WIDTH * np.percentile(extent[:, self.cross_axis], 99), 1e-6) if len(live) else 1.0
+        self.origin = lo[live, self.cross_axis].min(initial=0)
+        self._is_large = (hi - lo)[:, self.axis] > self.window
+        self.large = live[self._is_large[live]]
+        self.order = live[np.argsort(lo[live, self.axis], kind="stable")]
+        self.sorted_lo = lo[self.order, self.axis]
+
+    def __len__(self):
+        return len(self.order)
+
+    # --- Queries ---
+    def _candidates(self, qlo, qhi):
+        a = self.axis
+        start = np.searchsorted(self.sorted_lo, qlo[a] - self.window, side="left")
+        stop = np.searchsorted(self.sorted_lo, qhi[a], side="right")
+        ids = self.order[start:stop]
+        return np.concatenate([ids[~self._is_large[ids]], self.large])
+
+    def query_box(self, lo, hi):
+        """Ids of components touching the box [lo, hi], in ascending order."""
+        qlo, qhi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+        ids = self._candidates(qlo, qhi)
+        hit = np.all((self.store.lo[ids] <= qhi) & (self.store.hi[ids] >= qlo), axis=1)
+        return np.sort(ids[hit])
+
+    def query_boxes(self, ids):
+        """(a, b) id pairs where component b touches component a, for every a in ids (b != a)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        lo, hi = self.store.lo, self.store.hi
+        start = np.searchsorted(self.sorted_lo, lo[ids, self.axis] - self.window, side="left")
+        stop = np.searchsorted(self.sorted_lo, hi[ids, self.axis], side="right")
+        counts = stop - start
+        rows = np.repeat(np.arange(len(ids)), counts)
+        pos = np.arange(counts.sum()) + np.repeat(start - np.cumsum(counts) + counts, counts)
+        b = self.order[pos]
+        rows, b = rows[~self._is_large[b]], b[~self._is_large[b]]
+        rows = np.concatenate([rows, np.repeat(np.arange(len(ids)), len(self.large))])
+        b = np.concatenate([b, np.tile(self.large, len(ids))])
+        a = ids[rows]
+        hit = np.all((lo[b] <= hi[a]) & (hi[b] >= lo[a]), axis=1) & (a != b)
+        return a[hit], b[hit]
+
+    def query_point(self, point):
+        """Ids of components containing the point (boundary included)."""
+        return self.query_box(point, point)
+
+    def distance(self, point, ids=None):
+        """Euclidean distance from the point to each component box (0 inside)."""
+        p = np.asarray(point, dtype=float)
+        lo, hi = self.store.lo, self.store.hi
+        if ids is not None:
+            lo, hi = lo[ids], hi[ids]
+        gap = np.maximum(np.maximum(lo - p, p - hi), 0)
+        return np.sqrt((gap ** 2).sum(axis=1))
+
+    def nearest(self, point):
+        """(component id, distance) of the box closest to the point."""
+        if not len(self):
+            raise ValueError("Spatial index is empty")
+        p = np.asarray(point, dtype=float)
+        radius = max(self.window, 0.1)
+        bounds = np.ptp(np.vstack([self.store.lo, self.store.hi, p[None]]), axis=0).max()
+        while True:
+            ids = self.query_box(p - radius, p + radius) if radius <= bounds else self.order
+            if len(ids):
+                dist = self.distance(p, ids)
+                best = int(np.argmin(dist))
+                # Boxes outside the search cube are farther than the radius, so a hit within it is final.
+                if dist[best] <= radius or radius > bounds:
+                    return int(ids[best]), float(dist[best])
+            radius *= 2
+
+    # --- Clash detection ---
+    def strip_of(self, values):
+        return ((values - self.origin) // self.strip).astype(np.int64)
+
+    def sweep_entries(self):
+        """(component ids, strips) of the clash sweep, ordered by strip and then by lower bound.
+
+        Each box is entered in every strip its cross-axis range reaches, so a
+        box rarely appears more than twice.
+        """
+        first = self.strip_of(self.store.lo[self.order, self.cross_axis])
+        span = self.strip_of(self.store.hi[self.order, self.cross_axis]) - first + 1
+        strips = np.repeat(first, span) + np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+        # self.order is sorted by lower bound, so a stable sort by strip keeps that order within each strip.
+        order = np.argsort(strips, kind="stable")
+        return np.repeat(self.order, span)[order], strips[order]
+
+    def candidate_pairs(self, entries, strips):
+        """Yield (i, j) positions into entries for every pair overlapping on the sweep axis in one strip."""
+        n = len(entries)
+        lo, hi = self.store.lo[entries, self.axis], self.store.hi[entries, self.axis]
+        # Offsetting each strip past the whole model's extent makes one binary search stop at the strip's end.
+        base = lo.min(initial=0)
+        offset = strips * (hi.max(initial=0) - base + 1.0)
+        stop = np.searchsorted(offset + (lo - base), offset + (hi - base), side="right")
+        counts = np.maximum(stop - np.arange(n) - 1, 0)
+        ends = np.cumsum(counts)
+        first = 0
+        while first < n:
+            last = max(int(np.searchsorted(ends, ends[first] - counts[first] + PAIR_CHUNK, side="right")), first + 1)
+            rows = np.arange(first, min(last, n))
+            c = counts[rows]
+            i = np.repeat(rows, c)
+            j = i + 1 + np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)
+            yield i, j
+            first = rows[-1] + 1
+
+    def clashes(self, tolerance=CLASH_TOLERANCE):
+        """All pairs of components whose boxes overlap by more than the tolerance on every axis."""
+        entries, strips = self.sweep_entries()
+        # Per-axis bounds in sweep order, so each filter pass reads contiguous 1-D arrays.
+        lo = self.store.lo[entries].T.copy()
+        hi = self.store.hi[entries].T.copy()
+        axes = [ax for ax in range(3) if ax not in (self.axis, self.cross_axis)] + [self.cross_axis, self.axis]
+        found_a, found_b = [], []
+        for i, j in self.candidate_pairs(entries, strips):
+            for ax in axes:
+                keep = np.minimum(hi[ax, i], hi[ax, j]) - np.maximum(lo[ax, i], lo[ax, j]) > tolerance
+                i, j = i[keep], j[keep]
+            # A pair spanning several strips is met in each; keep it where its cross-axis overlap starts.
+            own = self.strip_of(np.maximum(lo[self.cross_axis, i], lo[self.cross_axis, j])) == strips[i]
+            found_a.append(entries[i[own]])
+            found_b.append(entries[j[own]])
+        a = np.concatenate(found_a) if found_a else np.empty(0, dtype=np.int64)
+        b = np.concatenate(found_b) if found_b else np.empty(0, dtype=np.int64)
+        return ClashReport(self.store, np.minimum(a, b), np.maximum(a, b))
+
+
+class ClashReport:
+    """Pairwise clashes with the overlap box and intersection volume of each pair."""
+
+    def __init__(self, store, a, b):
+        self.store = store
+        order = np.lexsort((b, a))
+        self.a, self.b = a[order], b[order]
+        self.overlap = np.clip(np.minimum(store.hi[self.a], store.hi[self.b])
+                               - np.maximum(store.lo[self.a], store.lo[self.b]), 0, None)
+        self.volume = self.overlap.prod(axis=1)
+
+    def __len__(self):
+        return len(self.a)
+
+    def __iter__(self):
+        names = self.store.names
+        for a, b, volume in zip(self.a, self.b, self.volume):
+            yield names[a], names[b], float(volume)
+
+    def involving(self, name):
+        cid = self.store.id(name)
+        return np.flatnonzero((self.a == cid) | (self.b == cid))
+
+    def to_frame(self):
+        import pandas as pd
+
+        names = np.array(self.store.names, dtype=object)
+        rooms = self.store.rooms.decode(self.store.codes("room"))
+        df = pd.DataFrame({
+            "Component A": names[self.a],
+            "Component B": names[self.b],
+            "Room A": rooms[self.a],
+            "Room B": rooms[self.b],
+            "Overlap X (m)": self.overlap[:, 0].round(3),
+            "Overlap Y (m)": self.overlap[:, 1].round(3),
+            "Overlap Z (m)": self.overlap[:, 2].round(3),
+            "Volume (m³)": self.volume.round(4),
+        })
+        return df.sort_values("Volume (m³)", ascending=False, kind="stable", ignore_index=True)
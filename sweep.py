@@ -0,0 +1,118 @@
+"""Parametric design sweep: python sweep.py --vary T=0.15:0.30:0.05 --vary CEILING_H=2.4,2.6,2.8"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import replace
+
+import numpy as np
+
+from model import Params, build_model
+from spatial import SpatialIndex
+from takeoff import Takeoff
+
+RESULT_COLUMNS = ["Components", "Net Wall Area (m²)", "Glazing Area (m²)", "Door Area (m²)",
+                  "Concrete/Masonry Volume (m³)", "Glazing Ratio", "Clashes"]
+
+
+def expand_grid(grid, base=Params()):
+    """Cartesian product of {name: [values]} as a list of Params."""
+    names = list(grid)
+    return [replace(base, **dict(zip(names, values))) for values in itertools.product(*grid.values())]
+
+
+def evaluate(params, keep_geometry=False):
+    """Build one variant and summarise it as a flat result row.
+
+    Glazing ratio is glazing over the whole envelope (net wall + glazing + doors).
+    """
+    model = build_model(params)
+    index = SpatialIndex(model.components)
+    clashes = index.clashes()
+    totals = Takeoff(model.components, index, clashes).totals()
+    envelope = totals["Net Wall Area (m²)"] + totals["Glazing Area (m²)"] + totals["Door Area (m²)"]
+    row = params.as_dict()
+    row.update({
+        "Components": len(model),
+        "Net Wall Area (m²)": round(totals["Net Wall Area (m²)"], 3),
+        "Glazing Area (m²)": round(totals["Glazing Area (m²)"], 3),
+        "Door Area (m²)": round(totals["Door Area (m²)"], 3),
+        "Concrete/Masonry Volume (m³)": round(totals["Concrete/Masonry Volume (m³)"], 3),
+        "Glazing Ratio": round(totals["Glazing Area (m²)"] / envelope, 4) if envelope else 0.0,
+        "Clashes": len(clashes),
+    })
+    if keep_geometry:
+        row["model"] = model
+    return row
+
+
+def run_sweep(variants, workers=None, keep_geometry=False):
+    """Evaluate variants on a process pool, yielding result rows as they finish.
+
+    At most a few tasks per worker are in flight, so memory stays bounded no
+    matter how large the grid is; geometry is dropped in the worker unless asked for.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = iter(variants)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            for params in itertools.islice(pending, 4 * workers - len(running)):
+                running.add(pool.submit(evaluate, params, keep_geometry))
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def sweep_table(rows):
+    import pandas as pd
+
+    return pd.DataFrame(list(rows))
+
+
+# --- Command Line ---
+def parse_values(spec):
+    """'0.15:0.30:0.05' (inclusive range) or '2.4,2.6,2.8' -> list of floats."""
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 6).tolist()
+    return [float(x) for x in spec.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep construction constants and tabulate each variant.")
+    parser.add_argument("--vary", action="append", default=[], metavar="NAME=VALUES", required=True,
+                        help="constant to vary, as start:stop:step or a comma list (repeatable)")
+    parser.add_argument("--workers", type=int, help="process count (default: all cores)")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    fields = Params().as_dict()
+    grid = {}
+    for item in args.vary:
+        name, sep, spec = item.partition("=")
+        if not sep or name not in fields:
+            parser.error(f"--vary expects NAME=VALUES with NAME one of: {', '.join(fields)}")
+        grid[name] = parse_values(spec)
+    variants = expand_grid(grid)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=list(fields) + RESULT_COLUMNS)
+        writer.writeheader()
+        for n, row in enumerate(run_sweep(variants, args.workers), 1):
+            writer.writerow(row)
+            out.flush()
+            print(f"{n}/{len(variants)}", end="\r", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from collections import defaultdict
+
+import numpy as np
+
+from spatial import CLASH_TOLERANCE, SpatialIndex
+
+QUANTITIES = ["Gross Wall Area (m²)", "Openings (m²)", "Net Wall Area (m²)",
+              "Glazing Area (m²)", "Door Area (m²)", "Concrete/Masonry Volume (m³)"]
+GROSS, OPENINGS, NET, GLAZING, DOORS, VOLUME = range(len(QUANTITIES))
+
+WALL_KINDS = ("Wall",)
+OPENING_KINDS = ("Glazing", "Door")
+SOLID_KINDS = ("Wall", "Slab", "Stair")
+GROUP_COLUMNS = ("room", "floor", "color", "kind")
+
+
+class Takeoff:
+    """Quantity takeoff over a ComponentStore.
+
+    Every component contributes one row of QUANTITIES. Wall faces are measured
+    along their long side; glazing and doors that cut into a wall (rather than
+    filling a gap between its sill and header) are deducted from that wall's area
+    and volume. See _cuts for when an opening counts as cutting a wall. Group totals are kept per room, floor, color and kind and are
+    patched by delta when components change: update() re-tests a changed opening
+    against the walls only (or a changed wall against the openings) in one
+    vectorized pass, and no other component is rescanned.
+    """
+
+    def __init__(self, store, index=None, clashes=None):
+        """index and clashes may be passed in when the caller has already built them for this store."""
+        self.store = store
+        self.deductions = {}  # (opening id, wall id) -> (area, volume)
+        self._partners = defaultdict(set)
+        # Both define __len__, so test for None: an empty index or report is still a valid one.
+        index = SpatialIndex(store) if index is None else index
+        self._compute(index, index.clashes() if clashes is None else clashes)
+
+    # --- Classification ---
+    def _kind_in(self, ids, kinds):
+        codes = [self.store.kinds.lookup(kind) for kind in kinds]
+        return np.isin(self.store.codes("kind")[ids], codes)
+
+    def _cuts(self, openings, walls):
+        """Mask of the (opening, wall) pairs in which the opening cuts the wall.
+
+        A solid opening cuts a wall it clashes with (spatial.SpatialIndex.clashes).
+        A pane drawn with no thickness never clashes; it cuts a wall when it lies
+        inside the wall's thickness, parallel to its face, and covers part of
+        that face by more than the clash tolerance in both directions.
+        """
+        lo, hi = self.store.lo, self.store.hi
+        overlap = np.minimum(hi[openings], hi[walls]) - np.maximum(lo[openings], lo[walls])
+        solid = np.all(overlap > CLASH_TOLERANCE, axis=1)
+        extent = hi[walls] - lo[walls]
+        across = (extent[:, 0] >= extent[:, 1]).astype(np.int64)  # the wall's thickness axis
+        thin = hi[openings, across] - lo[openings, across] <= CLASH_TOLERANCE
+        inside = ((lo[openings, across] > lo[walls, across] + CLASH_TOLERANCE)
+                  & (hi[openings, across] < hi[walls, across] - CLASH_TOLERANCE))
+        on_face = (overlap[np.arange(len(walls)), 1 - across] > CLASH_TOLERANCE) & (overlap[:, 2] > CLASH_TOLERANCE)
+        return solid | (thin & inside & on_face)
+
+    def _deduction(self, openings, walls):
+        """Area cut from each wall face and volume cut from its body."""
+        lo, hi = self.store.lo, self.store.hi
+        overlap = np.clip(np.minimum(hi[openings], hi[walls]) - np.maximum(lo[openings], lo[walls]), 0, None)
+        extent = hi[walls] - lo[walls]
+        along = np.where(extent[:, 0] >= extent[:, 1], overlap[:, 0], overlap[:, 1])
+        return along * overlap[:, 2], overlap.prod(axis=1)
+
+    def _rows(self, ids, open_area, open_volume):
+        extent = self.store.hi[ids] - self.store.lo[ids]
+        face = np.maximum(extent[:, 0], extent[:, 1]) * extent[:, 2]
+        is_wall = self._kind_in(ids, WALL_KINDS)
+        rows = np.zeros((len(ids), len(QUANTITIES)))
+        rows[:, GROSS] = np.where(is_wall, face, 0)
+        rows[:, OPENINGS] = np.where(is_wall, open_area, 0)
+        rows[:, NET] = np.maximum(rows[:, GROSS] - rows[:, OPENINGS], 0)
+        rows[:, GLAZING] = np.where(self._kind_in(ids, ("Glazing",)), face, 0)
+        rows[:, DOORS] = np.where(self._kind_in(ids, ("Door",)), face, 0)
+        solid = self._kind_in(ids, SOLID_KINDS)
+        rows[:, VOLUME] = np.where(solid, np.maximum(extent.prod(axis=1) - open_volume, 0), 0)
+        rows[~self.store.alive[ids]] = 0
+        return rows
+
+    # --- Full build ---
+    def _compute(self, index, clashes):
+        n = len(self.store)
+        a, b = clashes.a, clashes.b
+        is_opening = self._kind_in(np.arange(n), OPENING_KINDS)
+        is_wall = self._kind_in(np.arange(n), WALL_KINDS)
+        # Edits never change a component's kind, so these stay valid through update().
+        self._openings, self._walls = np.flatnonzero(is_opening), np.flatnonzero(is_wall)
+        a_cuts, b_cuts = is_opening[a] & is_wall[b], is_opening[b] & is_wall[a]
+        # Panes have no thickness, so they never clash; look up the walls around them instead.
+        panes = np.flatnonzero(is_opening & self.store.alive & ((self.store.hi - self.store.lo).min(axis=1) <= CLASH_TOLERANCE))
+        around, touching = index.query_boxes(panes)
+        in_wall = is_wall[touching]
+        openings = np.concatenate([a[a_cuts], b[b_cuts], around[in_wall]])
+        walls = np.concatenate([b[a_cuts], a[b_cuts], touching[in_wall]])
+        cut = self._cuts(openings, walls)
+        openings, walls = openings[cut], walls[cut]
+        area, volume = self._deduction(openings, walls)
+        for key, value in zip(zip(openings.tolist(), walls.tolist()), zip(area.tolist(), volume.tolist())):
+            self.deductions[key] = value
+            self._partners[key[0]].add(key)
+            self._partners[key[1]].add(key)
+        open_area = np.bincount(walls, weights=area, minlength=n)
+        open_volume = np.bincount(walls, weights=volume, minlength=n)
+        self.values = self._rows(np.arange(n), open_area, open_volume)
+        self._codes = {col: self.store.codes(col).copy() for col in GROUP_COLUMNS}
+        self._sums = {col: self._group(col) for col in GROUP_COLUMNS}
+
+    def _group(self, column):
+        codes, size = self._codes[column], len(self.store.categories(column))
+        return np.stack([np.bincount(codes, weights=self.values[:, q], minlength=size)
+                         for q in range(len(QUANTITIES))], axis=1)
+
+    # --- Incremental update ---
+    def _recut(self, cid):
+        """Recompute the opening/wall pairs involving one component; returns the ids touched."""
+        touched = {cid}
+        for key in self._partners.pop(cid, ()):
+            self.deductions.pop(key, None)
+            other = key[1] if key[0] == cid else key[0]
+            self._partners[other].discard(key)
+            touched.add(other)
+        pairs = []
+        if self.store.alive[cid]:
+            if self._kind_in([cid], OPENING_KINDS)[0]:
+                walls = self._live(cid, self._walls)
+                pairs = [(cid, w) for w in walls[self._cuts(np.full(len(walls), cid), walls)].tolist()]
+            elif self._kind_in([cid], WALL_KINDS)[0]:
+                openings = self._live(cid, self._openings)
+                pairs = [(o, cid) for o in openings[self._cuts(openings, np.full(len(openings), cid))].tolist()]
+        if pairs:
+            openings, walls = np.array(pairs).T
+            area, volume = self._deduction(openings, walls)
+            for key, value in zip(pairs, zip(area.tolist(), volume.tolist())):
+                self.deductions[key] = value
+                self._partners[key[0]].add(key)
+                self._partners[key[1]].add(key)
+                touched.update(key)
+        return touched
+
+    def _live(self, cid, others):
+        return others[self.store.alive[others] & (others != cid)]
+
+    def update(self, ids):
+        """Refresh the rows of changed components (and the walls they cut) and patch group totals."""
+        touched = set()
+        for cid in np.atleast_1d(ids).tolist():
+            touched |= self._recut(cid)
+        ids = np.array(sorted(touched), dtype=np.int64)
+        for col in GROUP_COLUMNS:
+            np.subtract.at(self._sums[col], self._codes[col][ids], self.values[ids])
+        open_area = np.zeros(len(ids))
+        open_volume = np.zeros(len(ids))
+        for n, cid in enumerate(ids.tolist()):
+            for key in self._partners.get(cid, ()):
+                if key[1] == cid:
+                    open_area[n] += self.deductions[key][0]
+                    open_volume[n] += self.deductions[key][1]
+        self.values[ids] = self._rows(ids, open_area, open_volume)
+        for col in GROUP_COLUMNS:
+            self._codes[col][ids] = self.store.codes(col)[ids]
+            size = len(self.store.categories(col))
+            if size > len(self._sums[col]):
+                self._sums[col] = np.pad(self._sums[col], ((0, size - len(self._sums[col])), (0, 0)))
+            np.add.at(self._sums[col], self._codes[col][ids], self.values[ids])
+        return ids
+
+    def apply(self, change):
+        """Patch the takeoff from a components.Change record."""
+        return self.update(change.ids)
+
+    # --- Results ---
+    def totals(self):
+        return dict(zip(QUANTITIES, self.values.sum(axis=0).tolist()))
+
+    def by(self, column):
+        """Quantities per label of a grouping column, skipping empty groups."""
+        labels = self.store.categories(column).labels
+        return {labels[code]: dict(zip(QUANTITIES, row.tolist()))
+                for code, row in enumerate(self._sums[column]) if row.any()}
+
+    def to_frame(self, column):
+        import pandas as pd
+
+        df = pd.DataFrame.from_dict(self.by(column), orient="index", columns=QUANTITIES).round(2)
+        df.index.name = column.title()
+        return df.reset_index()
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def edit():
+    """Function applying a move, resize, recolor and delete to walls and openings of a store; yields each Change."""
+    def apply(store):
+        kinds = store.codes("kind")
+        walls = np.flatnonzero(kinds == store.kinds.lookup("Wall"))
+        glazing = np.flatnonzero(kinds == store.kinds.lookup("Glazing"))
+        names = store.names
+        yield store.move(names[glazing[0]], dx=0.4, dz=0.1)
+        yield store.resize(names[walls[0]], z_range=(0.0, 2.0))
+        yield store.move(names[walls[1]], dy=-0.3)
+        yield store.recolor(names[walls[2]], "crimson", 0.7)
+        yield store.recolor(names[glazing[1]], "crimson", 0.7)
+        yield store.delete(names[glazing[2]])
+        yield store.delete(names[walls[3]])
+
+    return apply
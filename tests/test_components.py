@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from model import build_model
+
+
+def test_recolor_rejects_unknown_colors_without_changing_the_store():
+    store = build_model().components.copy()
+    name = store.names[0]
+    before, version = store.get(name), store.version
+    with pytest.raises(ValueError):
+        store.recolor(name, "Red Brick")
+    with pytest.raises(ValueError):
+        store.recolor(name, "crimson", opacity=1.5)
+    assert store.get(name) == before and store.version == version
+    store.recolor(name, "crimson", 0.5)
+    assert store.get(name)["color"] == "crimson" and np.isclose(store.get(name)["opacity"], 0.5)
@@ -0,0 +1,93 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from export import STL_TRIANGLE, color_rgba, write_glb, write_obj, write_stl
+from geometry import BOX_CORNERS, OUTWARD_FACES
+from model import build_model
+
+
+def test_outward_faces_point_out_of_the_unit_box():
+    corners = BOX_CORNERS.astype(float)
+    tris = corners[OUTWARD_FACES]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    assert np.all(np.einsum("ij,ij->i", normals, tris.mean(axis=1) - 0.5) > 0)
+
+
+def test_outward_faces_are_consistently_wound():
+    # In a closed, consistently wound mesh every directed edge appears exactly once.
+    edges = [(int(f[a]), int(f[(a + 1) % 3])) for f in OUTWARD_FACES for a in range(3)]
+    assert len(set(edges)) == len(edges) == 36
+    assert all((b, a) in edges for a, b in edges)
+
+
+def test_stl_normals_point_outward(tmp_path):
+    store = build_model().components
+    path = tmp_path / "model.stl"
+    write_stl(store, path)
+    data = path.read_bytes()
+    (count,) = struct.unpack_from("<I", data, 80)
+    records = np.frombuffer(data, dtype=STL_TRIANGLE, offset=84, count=count)
+    centres = np.repeat((store.lo + store.hi) / 2, 12, axis=0)
+    outward = np.einsum("ij,ij->i", records["normal"], records["vertices"].mean(axis=1) - centres)
+    # Zero-thickness panes have facets through their own centre; every solid box must face out.
+    solid = np.repeat(np.all(store.hi - store.lo > 0, axis=1), 12)
+    assert solid.sum() > 0
+    assert np.all(outward[solid] > 0)
+
+
+def test_glb_uses_outward_indices(tmp_path):
+    path = tmp_path / "model.glb"
+    write_glb(build_model().components, path)
+    data = path.read_bytes()
+    json_len = struct.unpack_from("<I", data, 12)[0]
+    blob = data[20 + json_len + 8:]
+    indices = np.frombuffer(blob, dtype="<u2", count=OUTWARD_FACES.size).reshape(-1, 3)
+    assert np.array_equal(indices, OUTWARD_FACES)
+
+
+def test_writers_skip_deleted_components(tmp_path):
+    store = build_model().components.copy()
+    gone = store.names[0]
+    store.delete(gone)
+    write_stl(store, tmp_path / "model.stl")
+    assert struct.unpack_from("<I", (tmp_path / "model.stl").read_bytes(), 80)[0] == 12 * (len(store) - 1)
+    write_obj(store, tmp_path / "model.obj")
+    objects = [line[2:] for line in (tmp_path / "model.obj").read_text().splitlines() if line.startswith("o ")]
+    assert len(objects) == len(store) - 1 and gone not in objects
+    write_glb(store, tmp_path / "model.glb")
+    data = (tmp_path / "model.glb").read_bytes()
+    gltf = json.loads(data[20:20 + struct.unpack_from("<I", data, 12)[0]])
+    assert len(gltf["meshes"]) == len(store) - 1
+    assert gone not in [node["name"] for node in gltf["nodes"]]
+
+
+@pytest.mark.parametrize("color, rgba", [
+    ("crimson", [220 / 255, 20 / 255, 60 / 255, 0.5]),
+    ("#abc", [0xaa / 255, 0xbb / 255, 0xcc / 255, 0.5]),
+    ("rgba(255, 0, 0, 0.5)", [1.0, 0.0, 0.0, 0.25]),
+    ("rgb(10%, 20%, 30%)", [0.1, 0.2, 0.3, 0.5]),
+    ("hsl(120, 100%, 25%)", [0.0, 0.5, 0.0, 0.5]),
+    ("hwb(240 0% 50%)", [0.0, 0.0, 0.5, 0.5]),
+])
+def test_color_rgba_parses_plotly_colors(color, rgba):
+    assert color_rgba(color, 0.5) == pytest.approx(rgba)
+
+
+@pytest.mark.parametrize("color", ["Red Brick", "lab(50% 40 59)"])
+def test_color_rgba_rejects_colors_it_cannot_export(color):
+    with pytest.raises(ValueError):
+        color_rgba(color)
+
+
+def test_glb_base_colors_are_linear(tmp_path):
+    store = build_model().components.copy()
+    store.recolor(store.names[0], "#808080", 1.0)
+    write_glb(store, tmp_path / "model.glb")
+    data = (tmp_path / "model.glb").read_bytes()
+    gltf = json.loads(data[20:20 + struct.unpack_from("<I", data, 12)[0]])
+    factors = [m["pbrMetallicRoughness"]["baseColorFactor"] for m in gltf["materials"]]
+    # sRGB 128/255 is about 0.216 in linear light.
+    assert [0.2158605, 0.2158605, 0.2158605, 1.0] == pytest.approx(factors[-1])
@@ -0,0 +1,16 @@
+import pytest
+
+from geometry import FACES_PER_BOX, VERTS_PER_BOX, component_at
+from model import build_model
+from payload import SceneCache
+
+
+@pytest.mark.parametrize("view", [{}, {"floor": ["First"]}, {"room": ["R3"]}], ids=["all", "first", "r3"])
+def test_component_at_maps_trace_indices_to_the_view_members(view):
+    store = build_model().components
+    ids = store.select(**view) if view else None
+    scene = SceneCache(store, ids)
+    for code, members in scene.members.items():
+        for pos, cid in enumerate(members.tolist()):
+            assert component_at(store, code, vertex=pos * VERTS_PER_BOX + VERTS_PER_BOX - 1, ids=ids) == cid
+            assert component_at(store, code, face=pos * FACES_PER_BOX, ids=ids) == cid
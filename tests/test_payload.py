@@ -0,0 +1,47 @@
+import base64
+
+import numpy as np
+import pytest
+
+from model import build_model
+from payload import SceneCache
+
+
+def decoded(trace):
+    def values(column):
+        if isinstance(column, dict):
+            return np.frombuffer(base64.b64decode(column["bdata"]), dtype=np.dtype(column["dtype"]).newbyteorder("<"))
+        return np.asarray(column)
+
+    return {key: values(trace[key]).astype(float).tolist() if key in "xyzijk" else value
+            for key, value in trace.items()}
+
+
+@pytest.mark.parametrize("quantize", [True, False])
+@pytest.mark.parametrize("floor", [None, "Ground"])
+def test_patched_scene_cache_equals_a_fresh_build(edit, quantize, floor):
+    store = build_model().components.copy()
+    ids = None if floor is None else store.select(floor=[floor])
+    scene = SceneCache(store, ids, quantize=quantize)
+    for change in edit(store):
+        scene.apply(change)
+    fresh = SceneCache(store, ids, quantize=quantize)
+    assert sorted(scene.traces) == sorted(fresh.traces)
+    for code in fresh.traces:
+        assert decoded(scene.traces[code]) == decoded(fresh.traces[code]), code
+
+
+def test_edits_outside_a_view_leave_it_untouched():
+    store = build_model().components.copy()
+    scene = SceneCache(store, store.select(floor=["First"]))
+    before = {code: dict(trace) for code, trace in scene.traces.items()}
+    assert scene.apply(store.move("R1 North Wall", dx=0.5)) == {}
+    assert scene.apply(store.recolor("R1 North Wall", "crimson")) == {}
+    assert scene.traces == before
+
+
+def test_unfiltered_view_patches_the_changed_vertex_range():
+    store = build_model().components.copy()
+    scene = SceneCache(store)
+    change = store.move("R1 North Wall", dz=0.25)
+    assert scene.apply(change) == change.vertex_ranges
@@ -0,0 +1,73 @@
+import pytest
+
+from model import build_model
+from search import SearchIndex
+
+
+@pytest.fixture(scope="module")
+def store():
+    return build_model().components
+
+
+def label(store, column, cid):
+    return str(store.categories(column).labels[store.codes(column)[cid]]).lower()
+
+
+@pytest.mark.parametrize("text", ["1", "ll", "-", "_1", "r1", "wall", "north wall", "hall east", "zzz", "GLASS b"])
+def test_words_match_names_and_attributes_as_substrings(store, text):
+    def matches(cid):
+        fields = [store.names[cid].lower()] + [label(store, col, cid) for col in ("kind", "room", "floor", "color")]
+        return all(any(word in field for field in fields) for word in text.lower().split())
+
+    expected = [cid for cid in range(len(store)) if matches(cid)]
+    assert SearchIndex(store).search(text).ids.tolist() == expected
+
+
+def test_filters_and_ranges(store):
+    index = SearchIndex(store)
+    result = index.search("glass", floor=["First"], ranges={"Height (m)": (1, 3)})
+    height = index.dimensions()["Height (m)"]
+    assert len(result)
+    for cid in result.ids:
+        assert label(store, "floor", cid) == "first" and 1 <= height[cid] <= 3
+
+
+def test_shared_index_survives_concurrent_sessions(store):
+    # One index serves every session; hammer its bounded caches from several threads.
+    import threading
+
+    index = SearchIndex(store)
+    errors = []
+
+    def session(n):
+        try:
+            for i in range(200):
+                result = index.search(f"{(n + i) % 30}")
+                if i % 20 == 0:
+                    result.export("csv")
+        except Exception as err:  # noqa: BLE001 - any failure fails the test
+            errors.append(err)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(index._results) <= 8 and len(index._exports) <= 8
+
+
+def test_edited_copy_patches_dimensions_like_a_fresh_index(store):
+    shared = SearchIndex(store)
+    edited = store.copy()
+    index = shared.copy(edited)
+    names = edited.names
+    for change in (edited.move(names[0], dx=1.5, dz=0.2),
+                   edited.resize(names[1], x_range=(0.0, 7.25), z_range=(0.0, 3.1)),
+                   edited.delete(names[2])):
+        index.apply(change)
+    fresh = SearchIndex(edited).dimensions()
+    for column, values in index.dimensions().items():
+        assert (values == fresh[column]).all(), column
+    # The shared index is left as it was.
+    assert (shared.dimensions()["Length (m)"] == SearchIndex(store).dimensions()["Length (m)"]).all()
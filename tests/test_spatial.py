@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from bench import synthetic_building
+from components import ComponentStore
+from model import build_model
+from spatial import CLASH_TOLERANCE, SpatialIndex
+
+
+def brute_force_clashes(store, tolerance=CLASH_TOLERANCE):
+    live = np.flatnonzero(store.alive)
+    lo, hi = store.lo[live], store.hi[live]
+    overlap = np.minimum(hi[:, None], hi[None]) - np.maximum(lo[:, None], lo[None])
+    a, b = np.nonzero(np.triu(np.all(overlap > tolerance, axis=2), k=1))
+    return list(zip(live[a].tolist(), live[b].tolist()))
+
+
+def random_store(n, seed=0):
+    rng = np.random.default_rng(seed)
+    store = ComponentStore()
+    lo = rng.uniform(0, 20, (n, 3))
+    size = rng.exponential(1.0, (n, 3))
+    size[rng.random(n) < 0.05, 0] = 15  # a few outsized boxes, like slabs
+    for cid in range(n):
+        store.add(*zip(lo[cid], lo[cid] + size[cid]), f"Box {cid}", "grey", 1.0)
+    return store
+
+
+@pytest.mark.parametrize("store", [build_model().components, random_store(400), synthetic_building(9)],
+                         ids=["model", "random", "grid"])
+def test_clashes_match_brute_force(store):
+    report = SpatialIndex(store).clashes()
+    assert len(report) and np.all(report.volume > 0)
+    assert list(zip(report.a.tolist(), report.b.tolist())) == brute_force_clashes(store)
+
+
+def test_clashes_skip_deleted_components():
+    store = build_model().components.copy()
+    store.delete(store.names[int(SpatialIndex(store).clashes().a[0])])
+    report = SpatialIndex(store).clashes()
+    assert list(zip(report.a.tolist(), report.b.tolist())) == brute_force_clashes(store)
+
+
+def test_contained_boxes_clash_by_their_real_overlap():
+    store = ComponentStore()
+    store.add((0, 4), (0, 0.3), (0, 3), "Wall", "grey", 1.0)
+    store.add((1, 2), (0.15, 0.15), (1, 2), "Pane", "lightblue", 0.3)  # zero thickness, inside the wall
+    store.add((1, 2), (0.1, 0.2), (1, 2), "Block", "grey", 1.0)        # solid, inside the wall
+    report = SpatialIndex(store).clashes()
+    assert list(report) == [("Wall", "Block", pytest.approx(0.1))]
+
+
+def test_query_boxes_matches_query_box():
+    store = random_store(300, seed=1)
+    index = SpatialIndex(store)
+    a, b = index.query_boxes(np.arange(len(store)))
+    expected = {(cid, int(other)) for cid in range(len(store))
+                for other in index.query_box(store.lo[cid], store.hi[cid]) if other != cid}
+    assert set(zip(a.tolist(), b.tolist())) == expected
+
+
+def test_empty_index_has_no_clashes():
+    assert len(SpatialIndex(ComponentStore()).clashes()) == 0
@@ -0,0 +1,32 @@
+import pytest
+
+from model import Params
+from spatial import SpatialIndex
+from sweep import RESULT_COLUMNS, evaluate, expand_grid, parse_values, run_sweep
+
+
+def test_parse_values():
+    assert parse_values("0.15:0.30:0.05") == [0.15, 0.2, 0.25, 0.3]
+    assert parse_values("2.4,2.6,2.8") == [2.4, 2.6, 2.8]
+
+
+def test_expand_grid_is_the_cartesian_product():
+    variants = expand_grid({"T": [0.2, 0.25], "CEILING_H": [2.4, 2.6, 2.8]})
+    assert len(variants) == 6
+    assert {(p.T, p.CEILING_H) for p in variants} == {(t, h) for t in (0.2, 0.25) for h in (2.4, 2.6, 2.8)}
+    assert all(p.SLAB_TOP == Params().SLAB_TOP for p in variants)
+
+
+def test_evaluate_sweeps_clashes_once(monkeypatch):
+    calls = []
+    clashes = SpatialIndex.clashes
+    monkeypatch.setattr(SpatialIndex, "clashes", lambda self, *args: calls.append(1) or clashes(self, *args))
+    evaluate(Params())
+    assert len(calls) == 1
+
+
+def test_run_sweep_matches_evaluating_each_variant():
+    variants = expand_grid({"T": [0.2, 0.25]})
+    rows = sorted(run_sweep(variants, workers=1), key=lambda row: row["T"])
+    assert rows == [evaluate(params) for params in variants]
+    assert all(set(RESULT_COLUMNS) <= set(row) for row in rows)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from components import ComponentStore
+from model import build_model
+from takeoff import GROUP_COLUMNS, Takeoff
+
+
+def test_patched_takeoff_equals_a_fresh_build(edit):
+    store = build_model().components.copy()
+    takeoff = Takeoff(store)
+    for change in edit(store):
+        takeoff.apply(change)
+    fresh = Takeoff(store)
+    assert takeoff.deductions.keys() == fresh.deductions.keys()
+    np.testing.assert_allclose(takeoff.values, fresh.values, atol=1e-9)
+    assert takeoff.totals() == pytest.approx(fresh.totals())
+    for column in GROUP_COLUMNS:
+        patched, built = takeoff.by(column), fresh.by(column)
+        assert patched.keys() == built.keys(), column
+        for label in built:
+            assert patched[label] == pytest.approx(built[label], abs=1e-9), (column, label)
+
+
+def test_panes_cut_the_walls_they_lie_inside():
+    store = ComponentStore()
+    store.set_zone("Room", "Ground")
+    store.add((0, 4), (0, 0.3), (0, 3), "Wall", "grey", 1.0)
+    store.add((1, 2), (0.15, 0.15), (1, 2.5), "Pane in wall", "lightblue", 0.3, kind="Glazing")
+    store.add((3.5, 3.5), (0.1, 1.1), (1, 2), "Pane across wall", "lightblue", 0.3, kind="Glazing")
+    store.add((0.2, 0.8), (0, 0), (1, 2), "Pane on face", "lightblue", 0.3, kind="Glazing")
+    takeoff = Takeoff(store)
+    assert takeoff.deductions == {(1, 0): pytest.approx((1.5, 0.0))}
+    assert takeoff.totals()["Net Wall Area (m²)"] == pytest.approx(4 * 3 - 1.5)